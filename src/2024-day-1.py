@@ -18,6 +18,9 @@ from utils import (
 TotalDistance: typing.TypeAlias = int
 
 
+MODES: list[str] = ["comprehension", "functional", "numpy"]
+
+
 class EvaluateTotalDistance(typing.Protocol):
     def __call__(self, locations: Locations) -> TotalDistance: ...
 
@@ -49,7 +52,7 @@ def evaluate_total_distance_by_numpy(locations: Locations) -> TotalDistance:
         raise TypeError("Wrong locations passed - wrong type")
 
 
-def main(args: argparse.Namespace):
+def main(args: argparse.Namespace) -> TotalDistance:
     total_distance: TotalDistance
 
     read_locations: ReadingLocations
@@ -73,6 +76,7 @@ def main(args: argparse.Namespace):
     total_distance = evaluate_total_distance(locs)
 
     print(f"Total distance evaluated by <{args.mode}>: ", total_distance)
+    return total_distance
 
 
 if __name__ == "__main__":
@@ -80,7 +84,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["comprehension", "functional", "numpy"],
+        choices=MODES,
         default="comprehension",
         help="Mode of evaluation",
     )
@@ -1,8 +1,21 @@
+import argparse
 import typing
 import sys
 import uuid
 import logging
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import cached_property
+import numpy as np
+
+from utils import (
+    create_arg_parser,
+    validate_file_path,
+    parse_args_run_and_profile,
+    open_stream_of_rows,
+    StreamOfRows,
+    FilePath,
+)
 
 
 logging.basicConfig(level=logging.WARNING, handlers=[logging.StreamHandler(sys.stdout)])
@@ -11,21 +24,23 @@ logging.basicConfig(level=logging.WARNING, handlers=[logging.StreamHandler(sys.s
 log = logging.getLogger(__name__)
 
 
-FilePath: typing.TypeAlias = str
-StreamOfChars: typing.TypeAlias = typing.Iterator[str]
+MODES: list[str] = ["default", "dp", "compact"]
 
 
-class OpenStream(typing.Protocol):
-    def __call__(self, file: FilePath) -> StreamOfChars: ...
+class TrailSummary(typing.NamedTuple):
+    score: int
+    rating: int
 
 
-def stream_opener(file: FilePath) -> StreamOfChars:
-    with open(file) as file_handler:
-        while character := file_handler.read(1):
-            yield character
+class CountTrails(typing.Protocol):
+    def __call__(self, file: FilePath) -> TrailSummary: ...
 
 
-read_char: OpenStream = stream_opener
+class OpenStream(typing.Protocol):
+    def __call__(self, file: FilePath) -> StreamOfRows: ...
+
+
+read_rows: OpenStream = open_stream_of_rows
 
 
 @dataclass
@@ -69,17 +84,12 @@ class Map:
         self.point_getters += [self.get_point_up, self.get_point_right, self.get_point_down, self.get_point_left]
 
     def load_points(self, file_opener: OpenStream, file_path: str):
-        row = Row()
-        for character in file_opener(file_path):
-            if character == "\n":
-                self.add_row(row)
-                row = Row()
-                continue
-            if character == ".":
-                row.add_point(Point(lat=len(self.rows), long=len(row.points), height=-1))
-                continue
-            height = int(character)
-            row.add_point(Point(lat=len(self.rows), long=len(row.points), height=height))
+        for characters in file_opener(file_path):
+            row = Row()
+            for character in characters.decode("ascii"):
+                height = -1 if character == "." else int(character)
+                row.add_point(Point(lat=len(self.rows), long=len(row.points), height=height))
+            self.add_row(row)
 
     def count_trailheads(self) -> list[Point]:
         trailheads: list[Point] = []
@@ -224,16 +234,163 @@ class Trail:
             trailhead.add_trail(self)
 
 
-if __name__ == "__main__":
-    from rich import print
+Heights: typing.TypeAlias = np.typing.NDArray[np.int8]
+LevelValues: typing.TypeAlias = np.typing.NDArray[np.integer]
+
+
+TRAILHEAD: int = 0
+PEAK: int = 9
+OFFSETS: list[tuple[int, int]] = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+# peaks reachable from one trailhead are at most 18 steps apart, so peaks in the same position of 19 x 19 tiles
+# never meet in one bitset and they share their bit
+PEAK_TILE: int = 19
+BITS_PER_WORD: int = 64
+
+
+def read_heights(file: FilePath) -> Heights:
+    rows: list[bytes] = [row for row in read_rows(file) if row]
+    characters = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+    return np.where(characters == ord("."), -1, characters.astype(np.int8) - ord("0")).astype(np.int8)
+
+
+def climb_down(heights: Heights, values: LevelValues, combine: np.ufunc) -> LevelValues:
+    """Values of cells of a level are combined from their neighbours one level higher, from peaks to trailheads."""
+    rows, cols = heights.shape
+    padded_heights: Heights = np.pad(heights, 1, constant_values=-1)
+    padded_values: LevelValues = np.pad(values, 1)
+    inner_values: LevelValues = padded_values[1:-1, 1:-1]
+    nothing = values.dtype.type(0)
+    for level in range(PEAK - 1, TRAILHEAD - 1, -1):
+        gathered: LevelValues = np.zeros_like(values)
+        for row_offset, col_offset in OFFSETS:
+            neighbours = (slice(1 + row_offset, rows + 1 + row_offset), slice(1 + col_offset, cols + 1 + col_offset))
+            higher = padded_heights[neighbours] == level + 1
+            combine(gathered, np.where(higher, padded_values[neighbours], nothing), out=gathered)
+        at_level = heights == level
+        inner_values[at_level] = gathered[at_level]
+    return inner_values
+
 
-    file_path: FilePath = "../media/2024-day-10.input"
+def count_rating_by_levels(heights: Heights) -> int:
+    # count of distinct trails of a cell is the sum of counts of its higher neighbours, a peak has one
+    paths: LevelValues = climb_down(heights, (heights == PEAK).astype(np.int64), np.add)
+    return int(paths[heights == TRAILHEAD].sum())
 
+
+def count_score_by_levels(heights: Heights) -> int:
+    """Peaks reachable from a cell are the union of bitsets of its higher neighbours, counted per word of bits."""
+    peak_rows, peak_cols = np.nonzero(heights == PEAK)
+    peak_bits = (peak_rows % PEAK_TILE) * PEAK_TILE + peak_cols % PEAK_TILE
+    score: int = 0
+    for word in range(-(-PEAK_TILE * PEAK_TILE // BITS_PER_WORD)):
+        in_word = peak_bits // BITS_PER_WORD == word
+        bits: LevelValues = np.zeros(heights.shape, dtype=np.uint64)
+        bits[peak_rows[in_word], peak_cols[in_word]] = np.left_shift(
+            np.uint64(1), (peak_bits[in_word] % BITS_PER_WORD).astype(np.uint64)
+        )
+        reachable: LevelValues = climb_down(heights, bits, np.bitwise_or)
+        score += int(np.bitwise_count(reachable[heights == TRAILHEAD]).sum())
+    return score
+
+
+def count_trails_by_levels(file: FilePath) -> TrailSummary:
+    heights: Heights = read_heights(file)
+    return TrailSummary(score=count_score_by_levels(heights), rating=count_rating_by_levels(heights))
+
+
+# heights of cells are bytes, the border around the map and "." are not any height
+NO_HEIGHT: int = 0xFF
+HEIGHTS_OF_CHARACTERS: bytes = bytes.maketrans(b"0123456789.", bytes(range(10)) + bytes([NO_HEIGHT]))
+
+
+@dataclass
+class TopographicMap:
+    """Heights of the map in one byte per cell, rows follow each other in a flat array.
+
+    The map is padded by a border of cells without height, so the four neighbours of a cell of the map are always
+    at the same offsets and no lookup goes out of the array.
+    """
+
+    heights: bytes
+    cols: int
+
+    @classmethod
+    def from_rows(cls, rows: StreamOfRows) -> "TopographicMap":
+        padded: list[bytes] = [
+            bytes([NO_HEIGHT]) + row.translate(HEIGHTS_OF_CHARACTERS) + bytes([NO_HEIGHT]) for row in rows if row
+        ]
+        cols: int = len(padded[0]) if padded else 2
+        border: bytes = bytes([NO_HEIGHT]) * cols
+        return cls(heights=b"".join([border, *padded, border]), cols=cols)
+
+    @cached_property
+    def offsets(self) -> tuple[int, int, int, int]:
+        return -self.cols, 1, self.cols, -1
+
+    def trailheads(self) -> typing.Iterator[int]:
+        cell: int = self.heights.find(TRAILHEAD)
+        while cell >= 0:
+            yield cell
+            cell = self.heights.find(TRAILHEAD, cell + 1)
+
+    def climb(self, trailhead: int) -> TrailSummary:
+        """Climb from the trailhead level by level, keeping count of trails leading to every cell of the level."""
+        trails: dict[int, int] = {trailhead: 1}
+        for level in range(TRAILHEAD + 1, PEAK + 1):
+            higher: defaultdict[int, int] = defaultdict(int)
+            for cell, count in trails.items():
+                for offset in self.offsets:
+                    if self.heights[cell + offset] == level:
+                        higher[cell + offset] += count
+            trails = higher
+        return TrailSummary(score=len(trails), rating=sum(trails.values()))
+
+
+def count_trails_by_compact_map(file: FilePath) -> TrailSummary:
+    topographic_map = TopographicMap.from_rows(read_rows(file))
+    summaries: list[TrailSummary] = [topographic_map.climb(trailhead) for trailhead in topographic_map.trailheads()]
+    return TrailSummary(
+        score=sum(summary.score for summary in summaries), rating=sum(summary.rating for summary in summaries)
+    )
+
+
+def count_trails_by_paths(file: FilePath) -> TrailSummary:
     trail_map = Map()
-    trail_map.load_points(read_char, file_path)
+    trail_map.load_points(read_rows, file)
     trail_map.find_new_trails()
     trail_map.finish_trails()
+    return TrailSummary(score=trail_map.count_score(), rating=trail_map.count_rating())
+
+
+def main(args: argparse.Namespace) -> TrailSummary:
+    count_trails: CountTrails
+    match args.mode:
+        case "dp":
+            count_trails = count_trails_by_levels
+        case "compact":
+            count_trails = count_trails_by_compact_map
+        case _:
+            count_trails = count_trails_by_paths
 
-    print(open(file_path).read())
-    print("Score: ", trail_map.count_score())
-    print("Rating: ", trail_map.count_rating())
+    summary: TrailSummary = count_trails(args.file_path)
+    print(f"Counted score and rating of trailheads by mode <{args.mode}>: ", summary)
+    return summary
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = create_arg_parser(
+        (
+            "Go through the topographic map and find hiking trails - paths going from height 0 up to height 9\n"
+            "by steps of height 1 (up, down, left or right). Count the score of trailheads (reachable peaks)\n"
+            "and the rating of trailheads (distinct trails).\n"
+        )
+    )
+    parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="default",
+        help="Mode of solving these problems",
+    )
+
+    parse_args_run_and_profile(parser, main)
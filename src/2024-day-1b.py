@@ -1,6 +1,8 @@
 import argparse
 import typing
+from collections import Counter
 from rich import print
+import numpy as np
 
 from utils import (
     validate_file_path,
@@ -16,6 +18,9 @@ from utils import (
 SimilarityScore: typing.TypeAlias = int
 
 
+MODES: list[str] = ["numpy", "count", "counter"]
+
+
 class EvaluateSimilarityScore(typing.Protocol):
     def __call__(self, locations: Locations) -> SimilarityScore: ...
 
@@ -30,7 +35,27 @@ def evaluate_similarity_score_by_count(locations: Locations) -> SimilarityScore:
         raise TypeError("Wrong locations passed - wrong type")
 
 
-def main(args: argparse.Namespace):
+def evaluate_similarity_score_by_counter(locations: Locations) -> SimilarityScore:
+    if isinstance(locations, dict):
+        counts: Counter[int] = Counter(locations["second"])
+        return sum(value * counts[value] for value in locations["first"])
+    else:
+        raise TypeError("Wrong locations passed - wrong type")
+
+
+def evaluate_similarity_score_by_numpy(locations: Locations) -> SimilarityScore:
+    if isinstance(locations, np.ndarray):
+        first, second = locations[:, 0], locations[:, 1]
+        values, counts = np.unique(second, return_counts=True)
+        # join the first list to counts of sorted unique values of the second list
+        positions = np.minimum(np.searchsorted(values, first), len(values) - 1)
+        found = values[positions] == first
+        return int(np.sum(first[found] * counts[positions[found]]))
+    else:
+        raise TypeError("Wrong locations passed - wrong type")
+
+
+def main(args: argparse.Namespace) -> SimilarityScore:
     similarity_score: SimilarityScore
 
     read_locations: ReadingLocations
@@ -46,17 +71,15 @@ def main(args: argparse.Namespace):
     match args.mode:
         case "count":
             evaluate_similarity_score = evaluate_similarity_score_by_count
+        case "counter":
+            evaluate_similarity_score = evaluate_similarity_score_by_counter
         case _:
-
-            def evaluate(locations: Locations) -> SimilarityScore:
-                print(locations)
-                return -1
-
-            evaluate_similarity_score = evaluate
+            evaluate_similarity_score = evaluate_similarity_score_by_numpy
 
     similarity_score = evaluate_similarity_score(locs)
 
     print(f"Similarity score evaluated by <{args.mode}>: ", similarity_score)
+    return similarity_score
 
 
 if __name__ == "__main__":
@@ -64,7 +87,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["numpy", "count"],
+        choices=MODES,
         default="numpy",
         help="Mode of evaluation",
     )
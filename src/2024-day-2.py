@@ -1,6 +1,7 @@
 import argparse
 import typing
 from rich import print
+import numpy as np
 
 from utils import (
     validate_file_path,
@@ -8,13 +9,18 @@ from utils import (
     parse_args_run_and_profile,
     ReadingReports,
     Reports,
+    PaddedReports,
     read_reports_from_file,
+    numpy_read_reports,
 )
 
 
 ReportsSafeCount: typing.TypeAlias = int
 
 
+MODES: list[str] = ["logical", "sets", "numpy"]
+
+
 class EvaluateSafeCount(typing.Protocol):
     def __call__(self, reports: Reports) -> ReportsSafeCount: ...
 
@@ -40,7 +46,9 @@ def count_dec_or_inc(level: int, last_level: int, dec_or_inc: typing.Optional[in
         )
 
 
-def evaluate_safe_count_by_logical(reports: Reports) -> ReportsSafeCount:
+def evaluate_safe_count_by_logical(reports: Reports) -> ReportsSafeCount:  # noqa: C901 (6)
+    if not isinstance(reports, list):
+        raise TypeError("Wrong reports passed - wrong type")
     safe_count: ReportsSafeCount = 0
     for report in reports:
         dec_or_inc: typing.Optional[int] = None
@@ -65,6 +73,8 @@ def evaluate_safe_count_by_logical(reports: Reports) -> ReportsSafeCount:
 
 
 def evaluate_safe_count_by_sets(reports: Reports) -> ReportsSafeCount:
+    if not isinstance(reports, list):
+        raise TypeError("Wrong reports passed - wrong type")
     safe_count: ReportsSafeCount = 0
     report_level_diffs: set[int]
     for report in reports:
@@ -74,11 +84,24 @@ def evaluate_safe_count_by_sets(reports: Reports) -> ReportsSafeCount:
     return safe_count
 
 
-def main(args: argparse.Namespace):
+def evaluate_safe_count_by_numpy(reports: Reports) -> ReportsSafeCount:
+    if not isinstance(reports, PaddedReports):
+        raise TypeError("Wrong reports passed - wrong type")
+    diffs = np.diff(reports.levels, axis=1)
+    # differences behind the end of a report (in padding) do not break any report
+    padding = np.arange(diffs.shape[1]) >= reports.lengths[:, None] - 1
+    increasing = ((diffs >= 1) & (diffs <= 3)) | padding
+    decreasing = ((diffs <= -1) & (diffs >= -3)) | padding
+    return int(np.count_nonzero(increasing.all(axis=1) | decreasing.all(axis=1)))
+
+
+def main(args: argparse.Namespace) -> ReportsSafeCount:
     safe_count: ReportsSafeCount
 
     read_reports: ReadingReports
     match args.mode:
+        case "numpy":
+            read_reports = numpy_read_reports
         case _:
             read_reports = read_reports_from_file
 
@@ -88,12 +111,15 @@ def main(args: argparse.Namespace):
     match args.mode:
         case "sets":
             evaluate_safe_count = evaluate_safe_count_by_sets
+        case "numpy":
+            evaluate_safe_count = evaluate_safe_count_by_numpy
         case _:
             evaluate_safe_count = evaluate_safe_count_by_logical
 
     safe_count = evaluate_safe_count(reports)
 
     print(f"Safe reports count evaluated by <{args.mode}>: ", safe_count)
+    return safe_count
 
 
 if __name__ == "__main__":
@@ -103,7 +129,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["logical", "sets"],
+        choices=MODES,
         default="logical",
         help="Mode of evaluation",
     )
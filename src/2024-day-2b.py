@@ -1,23 +1,31 @@
 import typing
 import argparse
+import numpy as np
 from utils import (
     create_arg_parser,
     validate_file_path,
     parse_args_run_and_profile,
     Reports,
     ReadingReports,
+    PaddedReports,
     read_reports_from_file,
+    numpy_read_reports,
 )
 
 
 ReportsSafeCount: typing.TypeAlias = int
 
 
+MODES: list[str] = ["sets", "numpy"]
+
+
 class EvaluateSafeCount(typing.Protocol):
     def __call__(self, reports: Reports) -> ReportsSafeCount: ...
 
 
 def evaluate_safe_count_by_sets(reports: Reports) -> ReportsSafeCount:
+    if not isinstance(reports, list):
+        raise TypeError("Wrong reports passed - wrong type")
     safe_count: ReportsSafeCount = 0
     report_level_diffs: set[int]
     for rep in reports:
@@ -31,11 +39,46 @@ def evaluate_safe_count_by_sets(reports: Reports) -> ReportsSafeCount:
     return safe_count
 
 
-def main(args: argparse.Namespace):
+def safe_without_one_level(
+    levels: np.typing.NDArray[np.int64], lengths: np.typing.NDArray[np.int64], low: int, high: int
+) -> np.typing.NDArray[np.bool_]:
+    """For every report and every level, tell if the report is safe (steps in <low, high>) without that level.
+
+    Removing level k keeps steps before k - 1 and after k, and the step over the removed level is added.
+    """
+    count_of_reports, count_of_levels = levels.shape
+    level = np.arange(count_of_levels)
+    diffs = np.diff(levels, axis=1)
+    # steps behind the end of a report (in padding) do not break any report
+    steps_ok = ((diffs >= low) & (diffs <= high)) | (level[1:] >= lengths[:, None])
+    gaps = levels[:, 2:] - levels[:, :-2]
+    gaps_ok = ((gaps >= low) & (gaps <= high)) | (level[1:-1] >= lengths[:, None] - 1)
+    edge = np.ones((count_of_reports, 1), dtype=np.bool_)
+    before = np.hstack((edge, edge, np.logical_and.accumulate(steps_ok, axis=1)[:, :-1]))
+    after = np.hstack((np.logical_and.accumulate(steps_ok[:, ::-1], axis=1)[:, ::-1][:, 1:], edge, edge))
+    over = np.hstack((edge, gaps_ok, edge))
+    return before & after & over & (level < lengths[:, None])
+
+
+def evaluate_safe_count_by_numpy(reports: Reports) -> ReportsSafeCount:
+    if not isinstance(reports, PaddedReports):
+        raise TypeError("Wrong reports passed - wrong type")
+    levels, lengths = reports
+    if levels.shape[1] < 3:
+        # one level (or none) is left after removing one level, such a report is safe
+        return int(np.count_nonzero(lengths))
+    increasing = safe_without_one_level(levels, lengths, 1, 3)
+    decreasing = safe_without_one_level(levels, lengths, -3, -1)
+    return int(np.count_nonzero((increasing | decreasing).any(axis=1)))
+
+
+def main(args: argparse.Namespace) -> ReportsSafeCount:
     safe_count: ReportsSafeCount
 
     read_reports: ReadingReports
     match args.mode:
+        case "numpy":
+            read_reports = numpy_read_reports
         case _:
             read_reports = read_reports_from_file
 
@@ -43,11 +86,14 @@ def main(args: argparse.Namespace):
 
     evaluate_safe_count: EvaluateSafeCount
     match args.mode:
+        case "numpy":
+            evaluate_safe_count = evaluate_safe_count_by_numpy
         case _:
             evaluate_safe_count = evaluate_safe_count_by_sets
     safe_count = evaluate_safe_count(reports)
 
     print(f"Safe reports count evaluated by <{args.mode}>: ", safe_count)
+    return safe_count
 
 
 if __name__ == "__main__":
@@ -57,7 +103,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["sets"],
+        choices=MODES,
         default="sets",
         help="Mode of evaluation",
     )
@@ -1,25 +1,37 @@
 import typing
 import argparse
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 from utils import (
     create_arg_parser,
     validate_file_path,
     parse_args_run_and_profile,
-    MemRecords,
-    ReadingMemRecords,
+    FilePath,
+    Memory,
+    MappedMemory,
+    ReadingMemory,
     read_mem_records_from_file,
+    map_memory_of_file,
 )
 
 
 Summary: typing.TypeAlias = int
 
 
+MODES: list[str] = ["regex", "pool"]
+POOL_MODES: list[str] = ["pool"]
+
+
 class AddMultiplications(typing.Protocol):
-    def __call__(self, records: MemRecords) -> Summary: ...
+    def __call__(self, records: Memory) -> Summary: ...
 
 
-def add_multiplications_by_regex(records: MemRecords) -> Summary:
+def add_multiplications_by_regex(records: Memory) -> Summary:
+    if not isinstance(records, list):
+        raise TypeError("Wrong records passed - wrong type")
     summary: Summary = 0
     for record in records:
         for match in re.finditer(r"mul\((\d{1,3}),(\d{1,3})\)", record):
@@ -28,24 +40,73 @@ def add_multiplications_by_regex(records: MemRecords) -> Summary:
     return summary
 
 
-def main(args: argparse.Namespace):
+MULTIPLICATION_PATTERN: re.Pattern = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)")
+LONGEST_MULTIPLICATION: int = len(b"mul(123,123)")
+POOL_CHUNK_SIZE: int = 8 * 1024 * 1024
+
+# the memory mapped by a worker process of the pool
+mapped_memory: mmap.mmap | None = None
+
+
+def map_memory_in_worker(file: FilePath):
+    global mapped_memory
+    with open(file, "rb") as file_handler:
+        mapped_memory = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def add_multiplications_in_chunk(start: int, end: int) -> Summary:
+    """Add multiplications starting in the chunk, the chunk overlaps the next one, so none of them is cut."""
+    if mapped_memory is None:
+        raise RuntimeError("Memory is not mapped in this process")
+    summary: Summary = 0
+    for match in MULTIPLICATION_PATTERN.finditer(mapped_memory, start, end + LONGEST_MULTIPLICATION - 1):
+        if match.start() >= end:
+            # it belongs to the next chunk
+            break
+        summary += int(match.group(1)) * int(match.group(2))
+    return summary
+
+
+def add_multiplications_by_pool(records: Memory) -> Summary:
+    if not isinstance(records, MappedMemory):
+        raise TypeError("Wrong records passed - wrong type")
+    if records.size == 0:
+        # an empty file cannot be memory-mapped
+        return 0
+    count_of_chunks: int = -(-records.size // POOL_CHUNK_SIZE)
+    starts: range = range(0, records.size, POOL_CHUNK_SIZE)
+    ends: list[int] = [min(start + POOL_CHUNK_SIZE, records.size) for start in starts]
+    with ProcessPoolExecutor(
+        max_workers=min(count_of_chunks, os.cpu_count() or 1),
+        initializer=map_memory_in_worker,
+        initargs=(records.file,),
+    ) as pool:
+        return sum(pool.map(add_multiplications_in_chunk, starts, ends))
+
+
+def main(args: argparse.Namespace) -> Summary:
     summary: Summary
 
-    read_mem_records: ReadingMemRecords
+    read_mem_records: ReadingMemory
     match args.mode:
+        case "pool":
+            read_mem_records = map_memory_of_file
         case _:
             read_mem_records = read_mem_records_from_file
 
-    mem_records: MemRecords = read_mem_records(args.file_path)
+    mem_records: Memory = read_mem_records(args.file_path)
 
     add_multiplications: AddMultiplications
     match args.mode:
+        case "pool":
+            add_multiplications = add_multiplications_by_pool
         case _:
             add_multiplications = add_multiplications_by_regex
 
     summary = add_multiplications(mem_records)
 
     print(f"Summary of multiplications added by <{args.mode}>: ", summary)
+    return summary
 
 
 if __name__ == "__main__":
@@ -55,7 +116,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["regex"],
+        choices=MODES,
         default="regex",
         help="Mode of summary",
     )
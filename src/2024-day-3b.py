@@ -1,4 +1,5 @@
 import typing
+import collections.abc
 import argparse
 import re
 
@@ -8,16 +9,21 @@ from utils import (
     parse_args_run_and_profile,
     MemRecord,
     MemRecords,
-    ReadingMemRecords,
+    Memory,
+    ReadingMemory,
     read_mem_records_from_file,
+    open_stream_of_mem_chunks,
 )
 
 
 Summary: typing.TypeAlias = int
 
 
+MODES: list[str] = ["regex", "stream"]
+
+
 class AddMultiplications(typing.Protocol):
-    def __call__(self, records: MemRecords) -> Summary: ...
+    def __call__(self, records: Memory) -> Summary: ...
 
 
 def simplify_record_of_memory(record: MemRecord) -> MemRecord:
@@ -52,7 +58,9 @@ def find_enabled_parts(record: MemRecord, flag_enabled: bool) -> tuple[MemRecord
     return enabled_parts, flag_enabled
 
 
-def add_multiplications_by_regex(records: MemRecords) -> Summary:
+def add_multiplications_by_regex(records: Memory) -> Summary:
+    if not isinstance(records, list):
+        raise TypeError("Wrong records passed - wrong type")
     summary: Summary = 0
     flag_enabled: bool = True
     for record in records:
@@ -66,24 +74,70 @@ def add_multiplications_by_regex(records: MemRecords) -> Summary:
     return summary
 
 
-def main(args: argparse.Namespace):
+# one pass over the memory finds all instructions in the order they come
+INSTRUCTION_PATTERN: re.Pattern = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+LONGEST_INSTRUCTION: int = len(b"mul(123,123)")
+
+
+def execute_instructions(buffer: bytes, enabled: bool, limit: int) -> tuple[Summary, bool, int]:
+    """Execute instructions starting before the limit, return the summary, the flag and where the rest starts.
+
+    An instruction starting before the limit is whole in the buffer, later ones may continue in the next chunk.
+    """
+    summary: Summary = 0
+    end: int = 0
+    for match in INSTRUCTION_PATTERN.finditer(buffer):
+        if match.start() >= limit:
+            break
+        if match.lastindex is None:
+            # do() or don't()
+            enabled = match.group() == b"do()"
+        elif enabled:
+            summary += int(match.group(1)) * int(match.group(2))
+        end = match.end()
+    return summary, enabled, max(limit, end)
+
+
+def add_multiplications_by_stream(records: Memory) -> Summary:
+    if not isinstance(records, collections.abc.Iterator):
+        raise TypeError("Wrong records passed - wrong type")
+    summary: Summary = 0
+    flag_enabled: bool = True
+    rest: bytes = b""
+    for chunk in records:
+        buffer: bytes = rest + chunk
+        found: Summary
+        found, flag_enabled, start = execute_instructions(
+            buffer, flag_enabled, max(0, len(buffer) - LONGEST_INSTRUCTION + 1)
+        )
+        summary += found
+        rest = buffer[start:]
+    return summary + execute_instructions(rest, flag_enabled, len(rest))[0]
+
+
+def main(args: argparse.Namespace) -> Summary:
     summary: Summary
 
-    read_mem_records: ReadingMemRecords
+    read_mem_records: ReadingMemory
     match args.mode:
+        case "stream":
+            read_mem_records = open_stream_of_mem_chunks
         case _:
             read_mem_records = read_mem_records_from_file
 
-    mem_records: MemRecords = read_mem_records(args.file_path)
+    mem_records: Memory = read_mem_records(args.file_path)
 
     add_multiplications: AddMultiplications
     match args.mode:
+        case "stream":
+            add_multiplications = add_multiplications_by_stream
         case _:
             add_multiplications = add_multiplications_by_regex
 
     summary = add_multiplications(mem_records)
 
     print(f"Summary of multiplications added by <{args.mode}>: ", summary)
+    return summary
 
 
 if __name__ == "__main__":
@@ -94,7 +148,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["regex"],
+        choices=MODES,
         default="regex",
         help="Mode of summary",
     )
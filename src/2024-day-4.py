@@ -1,6 +1,8 @@
 import re
 import typing
+import collections.abc
 import argparse
+import numpy as np
 
 from utils import (
     create_arg_parser,
@@ -8,7 +10,11 @@ from utils import (
     parse_args_run_and_profile,
     StreamOfLines,
     create_stream_of_lines,
+    WordSearch,
+    ReadingWordSearch,
+    read_grid,
 )
+from grid_patterns import Pattern, count_matches, orientations, stencil_pattern, word_pattern
 
 
 CountOfXmas: typing.TypeAlias = int
@@ -17,8 +23,13 @@ SearchPattern: typing.TypeAlias = list[tuple[int, str]]
 SearchPath: typing.TypeAlias = list[int]
 
 
+MODES: list[str] = ["line", "cross", "numpy", "numpy_cross"]
+# modes answering the same part of the puzzle
+PARTS: dict[str, list[str]] = {"line": ["line", "numpy"], "cross": ["cross", "numpy_cross"]}
+
+
 class SumCountOfXmas(typing.Protocol):
-    def __call__(self, data: typing.Iterator[StreamOfLines]) -> CountOfXmas: ...
+    def __call__(self, data: WordSearch) -> CountOfXmas: ...
 
 
 def find_xmas_horizontal(data: StreamOfLines) -> CountOfXmas:
@@ -70,7 +81,9 @@ def find_xmas_other_way(  # noqa: C901[6]
     return count
 
 
-def find_xmas_line(data: typing.Iterator[StreamOfLines]) -> CountOfXmas:
+def find_xmas_line(data: WordSearch) -> CountOfXmas:
+    if not isinstance(data, collections.abc.Iterator):
+        raise TypeError("Wrong word search passed - wrong type")
     count: int = 0
     search_path: SearchPath = list(range(4))
     count += find_xmas_horizontal(next(data))
@@ -80,7 +93,9 @@ def find_xmas_line(data: typing.Iterator[StreamOfLines]) -> CountOfXmas:
     return count
 
 
-def find_xmas_cross(data: typing.Iterator[StreamOfLines]) -> CountOfXmas:
+def find_xmas_cross(data: WordSearch) -> CountOfXmas:
+    if not isinstance(data, collections.abc.Iterator):
+        raise TypeError("Wrong word search passed - wrong type")
     count: int = 0
     search_path: SearchPath = list(range(3)) + list(range(3))
     count += find_xmas_other_way(
@@ -98,19 +113,47 @@ def find_xmas_cross(data: typing.Iterator[StreamOfLines]) -> CountOfXmas:
     return count
 
 
-def main(args: argparse.Namespace):
+XMAS_PATTERNS: list[Pattern] = orientations(word_pattern("XMAS"), diagonal=True)
+MAS_CROSS_PATTERNS: list[Pattern] = orientations(stencil_pattern(["M.S", ".A.", "M.S"]))
+
+
+def find_xmas_line_by_numpy(data: WordSearch) -> CountOfXmas:
+    if not isinstance(data, np.ndarray):
+        raise TypeError("Wrong word search passed - wrong type")
+    return count_matches(data, XMAS_PATTERNS)
+
+
+def find_xmas_cross_by_numpy(data: WordSearch) -> CountOfXmas:
+    if not isinstance(data, np.ndarray):
+        raise TypeError("Wrong word search passed - wrong type")
+    return count_matches(data, MAS_CROSS_PATTERNS)
+
+
+def main(args: argparse.Namespace) -> CountOfXmas:
     summary_of_count_of_xmas: CountOfXmas
 
+    read_word_search: ReadingWordSearch
+    match args.mode:
+        case "numpy" | "numpy_cross":
+            read_word_search = read_grid
+        case _:
+            read_word_search = create_stream_of_lines
+
     sum_count_of_xmas: SumCountOfXmas
     match args.mode:
         case "cross":
             sum_count_of_xmas = find_xmas_cross
+        case "numpy":
+            sum_count_of_xmas = find_xmas_line_by_numpy
+        case "numpy_cross":
+            sum_count_of_xmas = find_xmas_cross_by_numpy
         case _:
             sum_count_of_xmas = find_xmas_line
 
-    summary_of_count_of_xmas = sum_count_of_xmas(create_stream_of_lines(args.file_path))
+    summary_of_count_of_xmas = sum_count_of_xmas(read_word_search(args.file_path))
 
     print(f"Count of X-MAS calculated by mode <{args.mode}>: ", summary_of_count_of_xmas)
+    return summary_of_count_of_xmas
 
 
 if __name__ == "__main__":
@@ -120,7 +163,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["line", "cross"],
+        choices=MODES,
         default="line",
         help="Mode of counting",
     )
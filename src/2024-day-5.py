@@ -1,6 +1,10 @@
 import argparse
+import graphlib
+import os
 import typing
 import math
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from collections import defaultdict
 from dataclasses import dataclass
 
 from utils import (
@@ -9,10 +13,22 @@ from utils import (
     parse_args_run_and_profile,
     StreamOfLines,
     create_stream_of_lines,
+    read_batches_of_lines,
 )
 
 
 SUMMARY: typing.TypeAlias = int
+# pages which must be printed before the page (of the key)
+RuleIndex: typing.TypeAlias = dict[int, set[int]]
+
+
+MODES: list[str] = ["correct", "incorrect", "graph", "graph_incorrect", "pool", "pool_incorrect"]
+# modes answering the same part of the puzzle
+PARTS: dict[str, list[str]] = {
+    "correct": ["correct", "graph", "pool"],
+    "incorrect": ["incorrect", "graph_incorrect", "pool_incorrect"],
+}
+POOL_MODES: list[str] = ["pool", "pool_incorrect"]
 
 
 @dataclass
@@ -135,19 +151,128 @@ def add_up_middle_page_numbers_incorrect(stream: typing.Iterator[StreamOfLines])
     return summary
 
 
-def main(args: argparse.Namespace):
+def index_rules(lines: StreamOfLines) -> RuleIndex:
+    """Index rules from lines up to the empty line, which separates them from updates."""
+    pages_before: RuleIndex = defaultdict(set)
+    for line in lines:
+        if not line.strip():
+            break
+        page_fst, page_snd = line.split("|")
+        pages_before[int(page_snd)].add(int(page_fst))
+    return pages_before
+
+
+def is_correct_by_graph(update: list[int], pages_before: RuleIndex) -> bool:
+    position: dict[int, int] = {page: idx for idx, page in enumerate(update)}
+    return all(
+        position[before] < idx
+        for idx, page in enumerate(update)
+        for before in pages_before.get(page, set()) & position.keys()
+    )
+
+
+def correct_by_graph(update: list[int], pages_before: RuleIndex) -> list[int]:
+    # only rules between pages of the update matter, they have to order its pages completely
+    pages: set[int] = set(update)
+    return list(
+        graphlib.TopologicalSorter({page: pages_before.get(page, set()) & pages for page in update}).static_order()
+    )
+
+
+def find_middle_page_number_by_graph(update: list[int], pages_before: RuleIndex, add_mode: str) -> SUMMARY:
+    correct_update: bool = is_correct_by_graph(update, pages_before)
+    if correct_update and add_mode == "correct":
+        return update[len(update) // 2]
+    if not correct_update and add_mode == "incorrect":
+        return correct_by_graph(update, pages_before)[len(update) // 2]
+    return 0
+
+
+def add_up_middle_page_numbers_by_graph(stream: typing.Iterator[StreamOfLines], add_mode: str = "correct") -> SUMMARY:
+    summary: SUMMARY = 0
+    lines: StreamOfLines = next(stream)
+    pages_before: RuleIndex = index_rules(lines)
+    for line in lines:
+        if not line.strip():
+            continue
+        update: list[int] = [int(page) for page in line.split(",")]
+        summary += find_middle_page_number_by_graph(update, pages_before, add_mode)
+    return summary
+
+
+def add_up_middle_page_numbers_by_graph_incorrect(stream: typing.Iterator[StreamOfLines]) -> SUMMARY:
+    return add_up_middle_page_numbers_by_graph(stream, add_mode="incorrect")
+
+
+UPDATES_BATCH_SIZE: int = 10_000
+BATCHES_IN_FLIGHT_PER_WORKER: int = 2
+
+# the rule index of a worker process of the pool, it is never changed there
+shared_pages_before: RuleIndex = {}
+
+
+def share_rule_index(pages_before: RuleIndex):
+    global shared_pages_before
+    shared_pages_before = pages_before
+
+
+def add_up_batch_by_graph(lines: list[str], add_mode: str) -> SUMMARY:
+    return sum(
+        find_middle_page_number_by_graph([int(page) for page in line.split(",")], shared_pages_before, add_mode)
+        for line in lines
+        if line.strip()
+    )
+
+
+def collect_summaries(futures: set[Future], return_when: str) -> tuple[SUMMARY, set[Future]]:
+    done, pending = wait(futures, return_when=return_when)
+    return sum(future.result() for future in done), pending
+
+
+def add_up_middle_page_numbers_by_pool(stream: typing.Iterator[StreamOfLines], add_mode: str = "correct") -> SUMMARY:
+    summary: SUMMARY = 0
+    lines: StreamOfLines = next(stream)
+    pages_before: RuleIndex = index_rules(lines)
+    workers: int = os.cpu_count() or 1
+    # forked workers inherit the index, it is not sent with every batch
+    with ProcessPoolExecutor(max_workers=workers, initializer=share_rule_index, initargs=(pages_before,)) as pool:
+        pending: set[Future] = set()
+        for batch in read_batches_of_lines(lines, UPDATES_BATCH_SIZE):
+            if len(pending) >= BATCHES_IN_FLIGHT_PER_WORKER * workers:
+                # lines are not read sooner than a worker is ready for them
+                collected, pending = collect_summaries(pending, FIRST_COMPLETED)
+                summary += collected
+            pending.add(pool.submit(add_up_batch_by_graph, batch, add_mode))
+        collected, _ = collect_summaries(pending, ALL_COMPLETED)
+    return summary + collected
+
+
+def add_up_middle_page_numbers_by_pool_incorrect(stream: typing.Iterator[StreamOfLines]) -> SUMMARY:
+    return add_up_middle_page_numbers_by_pool(stream, add_mode="incorrect")
+
+
+def main(args: argparse.Namespace) -> SUMMARY:
     summary: SUMMARY
 
     adding_up_middle_page_numbers: AddingUpMiddlePageNumbersOfCorrectlyOrderedUpdates
     match args.mode:
         case "incorrect":
             adding_up_middle_page_numbers = add_up_middle_page_numbers_incorrect
+        case "graph":
+            adding_up_middle_page_numbers = add_up_middle_page_numbers_by_graph
+        case "graph_incorrect":
+            adding_up_middle_page_numbers = add_up_middle_page_numbers_by_graph_incorrect
+        case "pool":
+            adding_up_middle_page_numbers = add_up_middle_page_numbers_by_pool
+        case "pool_incorrect":
+            adding_up_middle_page_numbers = add_up_middle_page_numbers_by_pool_incorrect
         case _:
             adding_up_middle_page_numbers = add_up_middle_page_numbers
 
     summary = adding_up_middle_page_numbers(create_stream_of_lines(args.file_path))
 
     print(f"Added up middle page numbers correctly ordered updates by mode <{args.mode}>: ", summary)
+    return summary
 
 
 if __name__ == "__main__":
@@ -157,7 +282,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["correct", "incorrect"],
+        choices=MODES,
         default="correct",
         help="Mode of adding (from correctly/incorrectly ordered updates",
     )
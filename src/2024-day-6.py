@@ -1,6 +1,8 @@
 import argparse
 import typing
+import collections.abc
 from functools import reduce
+import numpy as np
 
 from utils import (
     create_arg_parser,
@@ -10,6 +12,7 @@ from utils import (
     StreamOfLines,
     FilePath,
 )
+from guard_patrol import PatrolMap, VisitedMap
 
 
 CountOfPositions: typing.TypeAlias = int
@@ -17,21 +20,25 @@ Grid: typing.TypeAlias = list[list[str]]
 Coords: typing.TypeAlias = tuple[int, int]
 Direction: typing.TypeAlias = str
 Directions: typing.TypeAlias = list[str]
+GuardPath: typing.TypeAlias = typing.Iterator[StreamOfLines] | VisitedMap
 
 
 POSSIBLE_DIRECTIONS: Directions = ["N", "E", "S", "W"]
 
 
+MODES: list[str] = ["default", "jump", "memory"]
+
+
 class Rules(typing.Protocol):
     def __call__(self, grid: Grid, current_coords: Coords, direction: Direction) -> tuple[Coords, Direction]: ...
 
 
 class PredictGuardMovements(typing.Protocol):
-    def __call__(self, stream: typing.Iterator[StreamOfLines], rules: Rules) -> typing.Iterator[StreamOfLines]: ...
+    def __call__(self, stream: typing.Iterator[StreamOfLines], rules: Rules) -> GuardPath: ...
 
 
 class AddUpCountOfDistinctPositionsInThePath(typing.Protocol):
-    def __call__(self, stream: typing.Iterator[StreamOfLines]) -> CountOfPositions: ...
+    def __call__(self, stream: GuardPath) -> CountOfPositions: ...
 
 
 def load_grid(stream: StreamOfLines) -> Grid:
@@ -75,26 +82,48 @@ def store_grid(grid: Grid, tmp_file: FilePath):
                 file_handler.write("\n")
 
 
-def predict_guard_movements_by_default(
-    stream: typing.Iterator[StreamOfLines], rules: Rules
-) -> typing.Iterator[StreamOfLines]:
-    tmp_file: FilePath = "/tmp/advent-of-code-data.tmp"
+def mark_guard_path(stream: typing.Iterator[StreamOfLines], rules: Rules) -> Grid:
     grid: Grid = load_grid(next(stream))
     start_coords: Coords | None = find_letter(grid)
     if start_coords:
         apply_rules(grid, start_coords, rules)
-    store_grid(grid, tmp_file)
+    return grid
+
+
+def predict_guard_movements_by_default(
+    stream: typing.Iterator[StreamOfLines], rules: Rules
+) -> typing.Iterator[StreamOfLines]:
+    tmp_file: FilePath = "/tmp/advent-of-code-data.tmp"
+    store_grid(mark_guard_path(stream, rules), tmp_file)
     return create_stream_of_lines(tmp_file)
 
 
+def predict_guard_movements_in_memory(stream: typing.Iterator[StreamOfLines], rules: Rules) -> GuardPath:
+    # the marked path is handed to counting as a bitmap, there is no temporary file (nor the empty trailing row)
+    return np.array([row for row in mark_guard_path(stream, rules) if row]) == "X"
+
+
 def adding_up_distinct_positions_for_line(line: str) -> CountOfPositions:
     return reduce(lambda accumulator, letter: accumulator + 1 if letter == "X" else accumulator, line, 0)
 
 
-def adding_up_distinct_positions_by_default(stream: typing.Iterator[StreamOfLines]) -> CountOfPositions:
+def adding_up_distinct_positions_by_default(stream: GuardPath) -> CountOfPositions:
+    if not isinstance(stream, collections.abc.Iterator):
+        raise TypeError("Wrong guard path passed - wrong type")
     return reduce(lambda accumulator, line: accumulator + adding_up_distinct_positions_for_line(line), next(stream), 0)
 
 
+def predict_guard_movements_by_jumps(stream: typing.Iterator[StreamOfLines], rules: Rules) -> GuardPath:
+    # the guard walks from an obstacle to the next one by the jump table, the rules of single steps are not needed
+    return PatrolMap.from_lines(next(stream)).visited_map()
+
+
+def adding_up_distinct_positions_by_bitmap(stream: GuardPath) -> CountOfPositions:
+    if not isinstance(stream, np.ndarray):
+        raise TypeError("Wrong guard path passed - wrong type")
+    return int(stream.sum())
+
+
 def get_next_coords(current_coords: Coords, direction: Direction) -> Coords:
     next_coords: Coords
     match direction:
@@ -134,7 +163,7 @@ def default_rules(grid: Grid, current_coords: Coords, direction: Direction) -> t
     return current_coords, direction
 
 
-def main(args: argparse.Namespace):
+def main(args: argparse.Namespace) -> CountOfPositions:
     count_of_positions: CountOfPositions
     stream: typing.Iterator[StreamOfLines] = create_stream_of_lines(args.file_path)
 
@@ -145,19 +174,26 @@ def main(args: argparse.Namespace):
 
     predict_guard_movements: PredictGuardMovements
     match args.mode:
+        case "jump":
+            predict_guard_movements = predict_guard_movements_by_jumps
+        case "memory":
+            predict_guard_movements = predict_guard_movements_in_memory
         case _:
             predict_guard_movements = predict_guard_movements_by_default
 
-    stream = predict_guard_movements(stream, rules)
+    guard_path: GuardPath = predict_guard_movements(stream, rules)
 
     adding_up_distinct_positions: AddUpCountOfDistinctPositionsInThePath
     match args.mode:
+        case "jump" | "memory":
+            adding_up_distinct_positions = adding_up_distinct_positions_by_bitmap
         case _:
             adding_up_distinct_positions = adding_up_distinct_positions_by_default
 
-    count_of_positions = adding_up_distinct_positions(stream)
+    count_of_positions = adding_up_distinct_positions(guard_path)
 
     print(f"Added up distinct positions of the guard in the path by mode <{args.mode}>: ", count_of_positions)
+    return count_of_positions
 
 
 if __name__ == "__main__":
@@ -172,7 +208,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["default"],
+        choices=MODES,
         default="default",
         help="Mode of solving these problems",
     )
@@ -1,5 +1,7 @@
 import argparse
+import os
 import typing
+from concurrent.futures import ProcessPoolExecutor
 
 from utils import (
     create_arg_parser,
@@ -8,6 +10,7 @@ from utils import (
     create_stream_of_lines,
     StreamOfLines,
 )
+from guard_patrol import Candidate, PatrolMap
 
 
 CountOfPositions: typing.TypeAlias = int
@@ -21,6 +24,10 @@ POSSIBLE_DIRECTIONS: Directions = list(typing.get_args(Direction))
 VISUALIZE_TIME_LOOP: dict[str, str] = {"N": "^", "S": "v", "W": "<", "E": ">"}
 
 
+MODES: list[str] = ["default", "jump", "pool"]
+POOL_MODES: list[str] = ["pool"]
+
+
 class Rules(typing.Protocol):
     def __call__(
         self, grid: Grid, coords: Coords, direction: Direction, count_of_new_blocks: CountOfPositions
@@ -191,7 +198,45 @@ def predict_movement_and_count_blocks_by_default(
     return count_of_new_blocks
 
 
-def main(args: argparse.Namespace):
+def count_blocks_by_jumps(stream: typing.Iterator[StreamOfLines], rules: Rules) -> CountOfPositions:
+    # the guard walks by the jump table with the new obstacle patched in, the rules of single steps are not needed
+    patrol_map: PatrolMap = PatrolMap.from_lines(next(stream))
+    return patrol_map.count_loops(patrol_map.candidates())
+
+
+CANDIDATES_BATCH_SIZE: int = 500
+
+# the map of a worker process of the pool, it is never changed there
+shared_patrol_map: PatrolMap | None = None
+# turns seen by a worker process, allocated once and reused by all its batches
+shared_seen: list[int] = []
+
+
+def share_patrol_map(patrol_map: PatrolMap):
+    global shared_patrol_map, shared_seen
+    shared_patrol_map = patrol_map
+    shared_seen = patrol_map.new_seen()
+
+
+def count_loops_in_worker(first_stamp: int, candidates: list[Candidate]) -> CountOfPositions:
+    if shared_patrol_map is None:
+        raise RuntimeError("Patrol map is not shared with this process")
+    return shared_patrol_map.count_loops(candidates, shared_seen, first_stamp)
+
+
+def count_blocks_by_pool(stream: typing.Iterator[StreamOfLines], rules: Rules) -> CountOfPositions:
+    patrol_map: PatrolMap = PatrolMap.from_lines(next(stream))
+    candidates: list[Candidate] = patrol_map.candidates()
+    # forked workers inherit the map with its jump table, it is not sent with every batch
+    patrol_map.build_jump_lists()
+    starts: range = range(0, len(candidates), CANDIDATES_BATCH_SIZE)
+    batches: list[list[Candidate]] = [candidates[idx : idx + CANDIDATES_BATCH_SIZE] for idx in starts]
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=share_patrol_map, initargs=(patrol_map,)) as pool:
+        # candidates are stamped by their index, so stamps of batches never repeat in the seen list of a worker
+        return sum(pool.map(count_loops_in_worker, [idx + 1 for idx in starts], batches))
+
+
+def main(args: argparse.Namespace) -> CountOfPositions:
     stream: typing.Iterator[StreamOfLines] = create_stream_of_lines(args.file_path)
 
     rules: Rules
@@ -201,12 +246,17 @@ def main(args: argparse.Namespace):
 
     predict_guard_movements: PredictGuardMovements
     match args.mode:
+        case "jump":
+            predict_guard_movements = count_blocks_by_jumps
+        case "pool":
+            predict_guard_movements = count_blocks_by_pool
         case _:
             predict_guard_movements = predict_movement_and_count_blocks_by_default
 
     count_new_blocks: CountOfPositions = predict_guard_movements(stream, rules)
 
     print(f"Added up blocks of the guard in the path by mode <{args.mode}>: ", count_new_blocks)
+    return count_new_blocks
 
 
 if __name__ == "__main__":
@@ -221,7 +271,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["default"],
+        choices=MODES,
         default="default",
         help="Mode of solving these problems",
     )
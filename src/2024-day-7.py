@@ -1,7 +1,12 @@
 import argparse
+import heapq
+import os
+import time
 import typing
 import itertools
 import functools
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 
 from utils import (
     create_arg_parser,
@@ -9,6 +14,7 @@ from utils import (
     parse_args_run_and_profile,
     StreamOfLines,
     create_stream_of_lines,
+    read_batches_of_lines,
 )
 
 
@@ -19,6 +25,12 @@ Operator: typing.TypeAlias = typing.Literal["+", "*", "||"]
 POSSIBLE_OPERATORS: list[str] = list(typing.get_args(Operator))
 
 
+MODES: list[str] = ["default", "all", "prune", "prune_all", "pool", "pool_all"]
+# modes answering the same part of the puzzle
+PARTS: dict[str, list[str]] = {"default": ["default", "prune", "pool"], "all": ["all", "prune_all", "pool_all"]}
+POOL_MODES: list[str] = ["pool", "pool_all"]
+
+
 class EquationPass(typing.Protocol):
     def __call__(self, line: str) -> SummaryOfPassed: ...
 
@@ -65,6 +77,50 @@ def equation_pass_by_all(line: str) -> SummaryOfPassed:
     return summary
 
 
+def power_of_ten_above(number: int) -> int:
+    power: int = 10
+    while power <= number:
+        power *= 10
+    return power
+
+
+def can_be_reached(target: int, args: list[int], powers: list[int], count: int, concatenation: bool) -> bool:
+    """Undo operators from the last operand to the first one, a branch ends as soon as the operator cannot be undone.
+
+    Operands are not negative, so results of + and * never decrease - the target cannot be smaller than the operand.
+    """
+    last: int = args[count - 1]
+    if count == 1:
+        return target == last
+    if concatenation and target % powers[count - 1] == last:
+        # strip digits of the operand from the end of the target
+        if can_be_reached(target // powers[count - 1], args, powers, count - 1, concatenation):
+            return True
+    # any result multiplied by zero is zero
+    if target == 0 == last or (
+        last and target % last == 0 and can_be_reached(target // last, args, powers, count - 1, concatenation)
+    ):
+        return True
+    return target >= last and can_be_reached(target - last, args, powers, count - 1, concatenation)
+
+
+def equation_pass_by_pruning(line: str, concatenation: bool) -> SummaryOfPassed:
+    left_side, numbers = line.split(":")
+    args: list[int] = [int(arg) for arg in numbers.split()]
+    powers: list[int] = [power_of_ten_above(arg) for arg in args] if concatenation else []
+    if can_be_reached(int(left_side), args, powers, len(args), concatenation):
+        return int(left_side)
+    return 0
+
+
+def equation_pass_by_prune(line: str) -> SummaryOfPassed:
+    return equation_pass_by_pruning(line, concatenation=False)
+
+
+def equation_pass_by_prune_all(line: str) -> SummaryOfPassed:
+    return equation_pass_by_pruning(line, concatenation=True)
+
+
 def adding_up_equations_by_default(
     stream: typing.Iterator[StreamOfLines], test_equation: EquationPass
 ) -> SummaryOfPassed:
@@ -74,7 +130,67 @@ def adding_up_equations_by_default(
     return summary_of_passed
 
 
-def main(args: argparse.Namespace):
+LINES_BATCH_SIZE: int = 1000
+BATCHES_IN_FLIGHT_PER_WORKER: int = 2
+SLOWEST_LINES: int = 5
+# a line is an outlier when it takes more than that many times of the mean time of a line
+OUTLIER_FACTOR: float = 20.0
+
+
+@dataclass
+class BatchReport:
+    summary: SummaryOfPassed = 0
+    count_of_lines: int = 0
+    seconds: float = 0.0
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+    def add(self, other: "BatchReport"):
+        self.summary += other.summary
+        self.count_of_lines += other.count_of_lines
+        self.seconds += other.seconds
+        self.slowest = heapq.nlargest(SLOWEST_LINES, self.slowest + other.slowest)
+
+    def outliers(self) -> list[tuple[float, str]]:
+        mean: float = self.seconds / self.count_of_lines if self.count_of_lines else 0.0
+        return [(seconds, line) for seconds, line in self.slowest if seconds > OUTLIER_FACTOR * mean]
+
+
+def evaluate_batch(lines: list[str], test_equation: EquationPass) -> BatchReport:
+    report: BatchReport = BatchReport(count_of_lines=len(lines))
+    timings: list[tuple[float, str]] = []
+    for line in lines:
+        start: float = time.perf_counter()
+        report.summary += test_equation(line.strip())
+        timings.append((time.perf_counter() - start, line.strip()))
+    report.seconds = sum(seconds for seconds, _ in timings)
+    report.slowest = heapq.nlargest(SLOWEST_LINES, timings)
+    return report
+
+
+def collect_reports(futures: set[Future], report: BatchReport, return_when: str) -> set[Future]:
+    done, pending = wait(futures, return_when=return_when)
+    for future in done:
+        report.add(future.result())
+    return pending
+
+
+def adding_up_equations_by_pool(stream: typing.Iterator[StreamOfLines], test_equation: EquationPass) -> SummaryOfPassed:
+    report: BatchReport = BatchReport()
+    workers: int = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future] = set()
+        for batch in read_batches_of_lines(next(stream), LINES_BATCH_SIZE):
+            if len(pending) >= BATCHES_IN_FLIGHT_PER_WORKER * workers:
+                # lines are not read sooner than a worker is ready for them
+                pending = collect_reports(pending, report, FIRST_COMPLETED)
+            pending.add(pool.submit(evaluate_batch, batch, test_equation))
+        collect_reports(pending, report, ALL_COMPLETED)
+    for seconds, line in report.outliers():
+        print(f"Slow equation ({seconds:.4f}s, mean {report.seconds / report.count_of_lines:.6f}s): {line}")
+    return report.summary
+
+
+def main(args: argparse.Namespace) -> SummaryOfPassed:
     summary_of_passed: SummaryOfPassed = 0
     stream: typing.Iterator[StreamOfLines] = create_stream_of_lines(args.file_path)
 
@@ -84,12 +200,25 @@ def main(args: argparse.Namespace):
         case "all":
             test_equation = equation_pass_by_all
             adding_up_equations = adding_up_equations_by_default
+        case "prune":
+            test_equation = equation_pass_by_prune
+            adding_up_equations = adding_up_equations_by_default
+        case "prune_all":
+            test_equation = equation_pass_by_prune_all
+            adding_up_equations = adding_up_equations_by_default
+        case "pool":
+            test_equation = equation_pass_by_prune
+            adding_up_equations = adding_up_equations_by_pool
+        case "pool_all":
+            test_equation = equation_pass_by_prune_all
+            adding_up_equations = adding_up_equations_by_pool
         case _:
             test_equation = equation_pass_by_default
             adding_up_equations = adding_up_equations_by_default
 
     summary_of_passed += adding_up_equations(stream, test_equation)
     print(f"Added up passed equations by mode <{args.mode}>: ", summary_of_passed)
+    return summary_of_passed
 
 
 if __name__ == "__main__":
@@ -102,7 +231,7 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=validate_file_path, help="Existing file path")
     parser.add_argument(
         "--mode",
-        choices=["default", "all"],
+        choices=MODES,
         default="default",
         help="Mode of solving these problems",
     )
@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+import typing
+from dataclasses import dataclass, asdict
+from rich import print
+from rich.table import Table
+
+from utils import FilePath, validate_dir_path
+from registry import (
+    Answer,
+    Day,
+    Mode,
+    Part,
+    Registry,
+    Solver,
+    MEDIA_DIR,
+    discover_solvers,
+    select_runs,
+)
+
+
+REGISTRY: Registry = discover_solvers()
+
+
+# answers of modes by the part of the puzzle by the day
+Disagreements: typing.TypeAlias = dict[Day, dict[Part, dict[Mode, str]]]
+
+
+@dataclass
+class InputSize:
+    lines: int
+    cells: int
+
+
+@dataclass
+class Measurement:
+    day: Day
+    mode: Mode
+    part: Part
+    answer: str
+    repeat: int
+    median: float
+    p95: float
+    # None for modes working in a process pool, only the memory of this process is traced
+    peak_memory: int | None
+    lines_per_second: float
+    cells_per_second: float
+
+
+def measure_input(file_path: FilePath) -> InputSize:
+    lines: int = 0
+    cells: int = 0
+    with open(file_path, "rb") as file_handler:
+        for line in file_handler:
+            lines += 1
+            cells += len(line.rstrip(b"\r\n"))
+    return InputSize(lines=lines, cells=cells)
+
+
+def percentile(samples: list[float], percent: int) -> float:
+    ordered: list[float] = sorted(samples)
+    rank: int = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def solve_quietly(solver: Solver, mode: Mode, file_path: FilePath) -> Answer:
+    # solvers print their answer (and sometimes much more), it must not be part of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return solver.solve(mode, file_path)
+
+
+def time_solver(solver: Solver, mode: Mode, file_path: FilePath) -> tuple[Answer, float]:
+    start: float = time.perf_counter()
+    answer: Answer = solve_quietly(solver, mode, file_path)
+    return answer, time.perf_counter() - start
+
+
+def trace_peak_memory(solver: Solver, mode: Mode, file_path: FilePath) -> int:
+    # separate run, tracemalloc slows down allocations a lot
+    tracemalloc.start()
+    try:
+        solve_quietly(solver, mode, file_path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_mode(solver: Solver, mode: Mode, file_path: FilePath, repeat: int, warmup: int) -> Measurement:
+    for _ in range(warmup):
+        solve_quietly(solver, mode, file_path)
+    answers: set[str] = set()
+    samples: list[float] = []
+    for _ in range(repeat):
+        answer, seconds = time_solver(solver, mode, file_path)
+        answers.add(str(answer))
+        samples.append(seconds)
+    if len(answers) > 1:
+        raise ValueError(f"Day {solver.day} mode <{mode}> is not deterministic: {answers}")
+    median: float = statistics.median(samples)
+    size: InputSize = measure_input(file_path)
+    return Measurement(
+        day=solver.day,
+        mode=mode,
+        part=solver.part(mode),
+        answer=answers.pop(),
+        repeat=repeat,
+        median=median,
+        p95=percentile(samples, 95),
+        peak_memory=None if mode in solver.pool_modes else trace_peak_memory(solver, mode, file_path),
+        lines_per_second=size.lines / median if median else 0.0,
+        cells_per_second=size.cells / median if median else 0.0,
+    )
+
+
+def find_disagreements(measurements: list[Measurement]) -> Disagreements:
+    """Modes answering the same part of the puzzle of the day, which do not agree on the answer."""
+    answers: Disagreements = {}
+    for measurement in measurements:
+        answers.setdefault(measurement.day, {}).setdefault(measurement.part, {})[measurement.mode] = measurement.answer
+    disagreements: Disagreements = {}
+    for day, parts in answers.items():
+        for part, modes in parts.items():
+            if len(set(modes.values())) > 1:
+                disagreements.setdefault(day, {})[part] = modes
+    return disagreements
+
+
+def store_results(output: FilePath, measurements: list[Measurement], disagreements: Disagreements):
+    """Append the results to the history of benchmark runs kept in the JSON file."""
+    history: list[dict] = []
+    if os.path.isfile(output):
+        with open(output) as file_handler:
+            history = json.load(file_handler)
+    history.append(
+        {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": [asdict(measurement) for measurement in measurements],
+            "disagreements": disagreements,
+        }
+    )
+    with open(output, "w") as file_handler:
+        json.dump(history, file_handler, indent=2)
+
+
+def print_measurements(measurements: list[Measurement], disagreements: Disagreements):
+    table: Table = Table(title="Advent Of Code - benchmark of modes")
+    for column in ["Day", "Mode", "Answer", "Median \\[s]", "p95 \\[s]", "Peak memory \\[KiB]", "Lines/s", "Cells/s"]:
+        table.add_column(column, justify="left" if column in ["Day", "Mode"] else "right")
+    for measurement in measurements:
+        answer: str = measurement.answer
+        if measurement.part in disagreements.get(measurement.day, {}):
+            answer = f"[red]{answer}[/red]"
+        table.add_row(
+            measurement.day,
+            measurement.mode,
+            answer,
+            f"{measurement.median:.6f}",
+            f"{measurement.p95:.6f}",
+            "-" if measurement.peak_memory is None else f"{measurement.peak_memory / 1024:.1f}",
+            f"{measurement.lines_per_second:,.0f}",
+            f"{measurement.cells_per_second:,.0f}",
+        )
+    print(table)
+    print_notes(measurements, disagreements)
+
+
+def print_notes(measurements: list[Measurement], disagreements: Disagreements):
+    for day, parts in disagreements.items():
+        for part, modes in parts.items():
+            label: str = f"day {day} (part {part})" if part else f"day {day}"
+            print(f"[red]Modes of {label} do not agree on the answer:[/red] ", modes)
+    if any(measurement.peak_memory is None for measurement in measurements):
+        print("Peak memory of modes working in a process pool is not traced (-).")
+
+
+def main(args: argparse.Namespace) -> list[Measurement]:
+    measurements: list[Measurement] = []
+    for solver, mode in select_runs(REGISTRY, args.days, args.modes):
+        measurements.append(benchmark_mode(solver, mode, solver.input_path(args.media), args.repeat, args.warmup))
+    disagreements: Disagreements = find_disagreements(measurements)
+    print_measurements(measurements, disagreements)
+    if args.output:
+        store_results(args.output, measurements, disagreements)
+        print(f"Results appended to: {args.output}")
+    return measurements
+
+
+def positive_int(value: str) -> int:
+    number: int = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Value '{value}' has to be a positive number.")
+    return number
+
+
+def create_benchmark_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--days", nargs="+", choices=list(REGISTRY), metavar="DAY", help="Days to benchmark")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=sorted({mode for solver in REGISTRY.values() for mode in solver.modes}),
+        metavar="MODE",
+        help="Benchmark only these modes of selected days (default all)",
+    )
+    parser.add_argument("--repeat", type=positive_int, default=5, help="Number of measured runs of every mode")
+    parser.add_argument("--warmup", type=int, default=1, help="Number of not measured runs before measuring")
+    return parser
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = create_benchmark_parser(
+        "Benchmark every mode of every day:\n\n"
+        "\t1) median/p95 of wall time, peak memory and throughput\n"
+        "\t2) check that all modes answering the same part of the day agree on the answer.\n"
+    )
+    parser.add_argument("--media", type=validate_dir_path, default=MEDIA_DIR, help="Directory with input files")
+    parser.add_argument("--output", type=str, default=None, help="JSON file to append the results to")
+    main(parser.parse_args())
@@ -0,0 +1,361 @@
+import argparse
+import hashlib
+import math
+import os
+import typing
+import numpy as np
+from rich import print
+
+from utils import FilePath
+from registry import ADVENT_YEAR
+import guard_patrol
+from guard_patrol import Cell, Direction, Obstacles
+
+
+DEFAULT_SEED: int = 2024
+
+
+Scale: typing.TypeAlias = float
+Lines: typing.TypeAlias = typing.Iterator[str]
+Generator: typing.TypeAlias = np.random.Generator
+
+
+class GenerateInput(typing.Protocol):
+    def __call__(self, rng: Generator, scale: Scale) -> Lines: ...
+
+
+def scaled(size: int, scale: Scale) -> int:
+    return max(1, round(size * scale))
+
+
+def scaled_side(side: int, scale: Scale) -> int:
+    # grids grow in both dimensions, so the count of cells is scaled
+    return max(4, round(side * math.sqrt(scale)))
+
+
+def grid_lines(grid: np.typing.NDArray[np.uint8]) -> Lines:
+    for row in grid:
+        yield row.tobytes().decode("ascii") + "\n"
+
+
+def generate_locations(rng: Generator, scale: Scale) -> Lines:
+    count: int = scaled(1000, scale)
+    first = rng.integers(10000, 100000, size=count)
+    # a part of the second list repeats values of the first one, so the similarity score is not zero
+    second = np.where(rng.random(count) < 0.3, rng.choice(first, size=count), rng.integers(10000, 100000, size=count))
+    for left, right in zip(first.tolist(), second.tolist()):
+        yield f"{left}   {right}\n"
+
+
+def generate_reports(rng: Generator, scale: Scale) -> Lines:
+    for _ in range(scaled(1000, scale)):
+        length: int = int(rng.integers(5, 9))
+        steps = rng.integers(1, 4, size=length - 1) * (1 if rng.random() < 0.5 else -1)
+        if rng.random() < 0.6:
+            # break the report at one level (it might be still safe with the Problem Dampener)
+            steps[rng.integers(0, length - 1)] = rng.integers(-5, 6)
+        levels = np.concatenate(([rng.integers(40, 60)], steps)).cumsum()
+        yield " ".join(str(level) for level in levels.tolist()) + "\n"
+
+
+MEMORY_NOISE: list[str] = list("!@#$%^&*()[]{}<>?,:;'+-~/| ") + [
+    "select()",
+    "how()",
+    "why()",
+    "what()",
+    "from()",
+    "who()",
+    "where()",
+    "mul[3,7]",
+    "mul(4*",
+    "mul ( 2 , 4 )",
+    "mul(1234,5)",
+    "do_not_mul(5,5)",
+]
+
+
+def memory_token(rng: Generator) -> str:
+    chance: float = rng.random()
+    if chance < 0.2:
+        return f"mul({rng.integers(1, 1000)},{rng.integers(1, 1000)})"
+    if chance < 0.21:
+        return "do()"
+    if chance < 0.22:
+        return "don't()"
+    return MEMORY_NOISE[rng.integers(0, len(MEMORY_NOISE))]
+
+
+def generate_memory(rng: Generator, scale: Scale) -> Lines:
+    for _ in range(scaled(6, scale)):
+        record: list[str] = []
+        length: int = 0
+        while length < 3000:
+            token: str = memory_token(rng)
+            record.append(token)
+            length += len(token)
+        yield "".join(record) + "\n"
+
+
+def generate_word_search(rng: Generator, scale: Scale) -> Lines:
+    side: int = scaled_side(140, scale)
+    letters = np.frombuffer(b"XMAS", dtype=np.uint8)
+    yield from grid_lines(letters[rng.integers(0, 4, size=(side, side))])
+
+
+def generate_page_ordering(rng: Generator, scale: Scale) -> Lines:
+    # rules are all pairs of pages in one (random) order, so every update has exactly one correct order
+    pages = rng.permutation(np.arange(10, 10 + scaled(49, math.sqrt(math.sqrt(scale)))))
+    order: dict[int, int] = {page: position for position, page in enumerate(pages.tolist())}
+    rules: list[tuple[int, int]] = [
+        (first, second) for first in order for second in order if order[first] < order[second]
+    ]
+    for idx in rng.permutation(len(rules)).tolist():
+        yield f"{rules[idx][0]}|{rules[idx][1]}\n"
+    yield "\n"
+    for _ in range(scaled(188, scale)):
+        update: list[int] = rng.choice(pages, size=2 * int(rng.integers(2, 12)) + 1, replace=False).tolist()
+        if rng.random() < 0.5:
+            update.sort(key=order.__getitem__)
+        yield ",".join(str(page) for page in update) + "\n"
+
+
+# bits of directions the guard walked a cell in
+WalkedDirections: typing.TypeAlias = np.typing.NDArray[np.uint8]
+GUARD_MOVES: list[tuple[int, int]] = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+ROWS_DRAWN_AT_ONCE: int = 1024
+
+
+def cells_ahead(array: np.typing.NDArray, row: int, col: int, direction: Direction) -> np.typing.NDArray:
+    """View of the cells in front of the guard up to the edge of the map, the nearest one first."""
+    match direction:
+        case guard_patrol.NORTH:
+            return array[:row, col][::-1]
+        case guard_patrol.EAST:
+            return array[row, col + 1 :]
+        case guard_patrol.SOUTH:
+            return array[row + 1 :, col]
+        case _:
+            return array[row, :col][::-1]
+
+
+def count_before(mask: np.typing.NDArray[np.bool_]) -> int:
+    if len(mask) == 0 or not mask.any():
+        return len(mask)
+    return int(np.argmax(mask))
+
+
+def choose_steps(rng: Generator, walked_ahead: WalkedDirections, direction: Direction, limit: int) -> int | None:
+    """Steps of the guard before the next obstacle, the obstacle must not stand on the path walked so far.
+
+    The guard must not turn where it already turned the same way, otherwise it is stuck in a time loop.
+    """
+    turned = np.uint8(1 << ((direction + 1) % 4))
+    fits = (walked_ahead[1 : limit + 1] == 0) & ((walked_ahead[:limit] & turned) == 0)
+    options = np.flatnonzero(fits)
+    return int(rng.choice(options)) + 1 if len(options) else None
+
+
+def plan_guard_path(rng: Generator, side: int, length: int) -> tuple[Obstacles, WalkedDirections, Cell] | None:
+    """Walk the guard from a start in the middle half of the map and place obstacles to turn it, until the path
+    is long enough and the guard can leave the map. None when the guard cannot go on.
+    """
+    obstacles: Obstacles = np.zeros((side, side), dtype=np.bool_)
+    walked: WalkedDirections = np.zeros((side, side), dtype=np.uint8)
+    row, col = (int(coord) for coord in rng.integers(side // 4, side - side // 4, size=2))
+    start: Cell = row * side + col
+    direction: Direction = guard_patrol.NORTH
+    steps: int = 0
+    while not walked[row, col] & (bit := np.uint8(1 << direction)):
+        walked[row, col] |= bit
+        walked_ahead: WalkedDirections = cells_ahead(walked, row, col, direction)
+        blocked: int = count_before(cells_ahead(obstacles, row, col, direction))
+        looping: int = count_before((walked_ahead & bit) != 0)
+        if steps >= length and blocked == looping == len(walked_ahead):
+            walked_ahead |= bit
+            return obstacles, walked, start
+        limit: int = min(blocked, looping, len(walked_ahead) - 1)
+        count: int | None = choose_steps(rng, walked_ahead, direction, limit)
+        if count is None and blocked > 0:
+            return None
+        if count is not None:
+            cells_ahead(obstacles, row, col, direction)[count] = True
+            walked_ahead[:count] |= bit
+            steps += count
+            row, col = row + count * GUARD_MOVES[direction][0], col + count * GUARD_MOVES[direction][1]
+        direction = (direction + 1) % 4
+    return None
+
+
+def generate_guard_map(rng: Generator, scale: Scale) -> Lines:
+    side: int = scaled_side(130, scale)
+    # the guard must not be stuck in a time loop, otherwise the guard path cannot be counted, and the path must be
+    # long (like in the original input), so its walk is measured, not the parsing of the map
+    while (plan := plan_guard_path(rng, side, side * side // 4)) is None:
+        pass
+    obstacles, walked, start = plan
+    for first_row in range(0, side, ROWS_DRAWN_AT_ONCE):
+        # more obstacles anywhere out of the path, they do not change it
+        rows = slice(first_row, first_row + ROWS_DRAWN_AT_ONCE)
+        drawn = rng.random(walked[rows].shape, dtype=np.float32) < 0.05
+        obstacles[rows] |= drawn & (walked[rows] == 0)
+    for row, blocked in enumerate(obstacles):
+        line = np.where(blocked, np.uint8(ord("#")), np.uint8(ord(".")))
+        if row == start // side:
+            line[start % side] = ord("^")
+        yield line.tobytes().decode("ascii") + "\n"
+
+
+def generate_equations(rng: Generator, scale: Scale) -> Lines:
+    for _ in range(scaled(850, scale)):
+        numbers: list[int] = rng.integers(1, 100, size=int(rng.integers(3, 13))).tolist()
+        result: int = numbers[0]
+        for number in numbers[1:]:
+            match rng.integers(0, 3):
+                case 0:
+                    result += number
+                case 1:
+                    result *= number
+                case _:
+                    result = int(f"{result}{number}")
+        if rng.random() < 0.5:
+            # most probably there is no product of operators for such a test value
+            result += int(rng.integers(1, 1000))
+        yield f"{result}: {' '.join(str(number) for number in numbers)}\n"
+
+
+FREQUENCIES: bytes = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def generate_antenna_map(rng: Generator, scale: Scale) -> Lines:
+    side: int = scaled_side(50, scale)
+    grid = np.full((side, side), ord("."), dtype=np.uint8)
+    antennas = rng.random((side, side)) < 0.058
+    grid[antennas] = np.frombuffer(FREQUENCIES, dtype=np.uint8)[rng.integers(0, len(FREQUENCIES), antennas.sum())]
+    yield from grid_lines(grid)
+
+
+def generate_disk_map(rng: Generator, scale: Scale) -> Lines:
+    count: int = scaled(10000, scale)
+    digits = rng.integers(0, 10, size=2 * count - 1)
+    # files are never empty
+    digits[::2] = rng.integers(1, 10, size=count)
+    yield (digits + ord("0")).astype(np.uint8).tobytes().decode("ascii") + "\n"
+
+
+def generate_topographic_map(rng: Generator, scale: Scale) -> Lines:
+    side: int = scaled_side(50, scale)
+    # slopes rise by one to the right and down, so there are hiking trails, random heights break many of them
+    rows = np.arange(side)[:, None]
+    cols = np.arange(side)[None, :]
+    heights = np.where(rng.random((side, side)) < 0.3, rng.integers(0, 10, size=(side, side)), (rows + cols) % 10)
+    yield from grid_lines((heights + ord("0")).astype(np.uint8))
+
+
+def generate_stones(rng: Generator, scale: Scale) -> Lines:
+    yield " ".join(str(stone) for stone in rng.integers(0, 10_000_000, size=scaled(8, scale)).tolist()) + "\n"
+
+
+def generate_garden(rng: Generator, scale: Scale) -> Lines:
+    side: int = scaled_side(140, scale)
+    # regions grow from a coarse grid of plant types, borders are roughened by random shifts
+    coarse = rng.integers(ord("A"), ord("Z") + 1, size=(side // 8 + 2, side // 8 + 2))
+    rows = (np.arange(side)[:, None] + rng.integers(0, 4, size=(side, side))) // 8
+    cols = (np.arange(side)[None, :] + rng.integers(0, 4, size=(side, side))) // 8
+    yield from grid_lines(coarse[rows, cols].astype(np.uint8))
+
+
+def generate_claw_machines(rng: Generator, scale: Scale) -> Lines:
+    for idx in range(scaled(320, scale)):
+        ax, ay, bx, by = rng.integers(10, 100, size=4).tolist()
+        a, b = rng.integers(1, 100, size=2).tolist()
+        prize_x, prize_y = a * ax + b * bx, a * ay + b * by
+        if rng.random() < 0.5:
+            prize_x += int(rng.integers(1, 100))
+        if idx > 0:
+            yield "\n"
+        yield f"Button A: X+{ax}, Y+{ay}\n"
+        yield f"Button B: X+{bx}, Y+{by}\n"
+        yield f"Prize: X={prize_x}, Y={prize_y}\n"
+
+
+GENERATORS: dict[int, GenerateInput] = {
+    1: generate_locations,
+    2: generate_reports,
+    3: generate_memory,
+    4: generate_word_search,
+    5: generate_page_ordering,
+    6: generate_guard_map,
+    7: generate_equations,
+    8: generate_antenna_map,
+    9: generate_disk_map,
+    10: generate_topographic_map,
+    11: generate_stones,
+    12: generate_garden,
+    13: generate_claw_machines,
+}
+
+
+def input_dir(output_dir: FilePath, scale: Scale, seed: int = DEFAULT_SEED) -> FilePath:
+    return os.path.join(output_dir, f"x{scale:g}-seed{seed}")
+
+
+def generators_fingerprint() -> str:
+    # any change of generators (or of the guard patrol used to plan the paths of day 6) makes the inputs stale
+    digest = hashlib.sha256()
+    for module_path in (__file__, guard_patrol.__file__):
+        with open(module_path, "rb") as file_handler:
+            digest.update(file_handler.read())
+    return digest.hexdigest()
+
+
+def generate_input(day: int, scale: Scale, output_dir: FilePath, seed: int = DEFAULT_SEED) -> FilePath:
+    """Write the input of the day (at the scale of the original input) to the directory for the scale and the seed.
+
+    The layout is the same as in the media directory, so a directory for the scale can be used instead of it.
+    Already generated inputs are reused, unless the generators changed since, the same seed produces the same input.
+    """
+    directory: FilePath = input_dir(output_dir, scale, seed)
+    os.makedirs(directory, exist_ok=True)
+    file_path: FilePath = os.path.join(directory, f"{ADVENT_YEAR}-day-{day}.input")
+    fingerprint_path: FilePath = file_path + ".fingerprint"
+    fingerprint: str = generators_fingerprint()
+    if os.path.isfile(file_path) and os.path.isfile(fingerprint_path):
+        with open(fingerprint_path) as file_handler:
+            if file_handler.read() == fingerprint:
+                return file_path
+    rng: Generator = np.random.default_rng([seed, day])
+    with open(file_path + ".tmp", "w") as file_handler:
+        file_handler.writelines(GENERATORS[day](rng, scale))
+    os.replace(file_path + ".tmp", file_path)
+    with open(fingerprint_path, "w") as file_handler:
+        file_handler.write(fingerprint)
+    return file_path
+
+
+def main(args: argparse.Namespace):
+    for scale in args.scale:
+        for day in args.days:
+            file_path: FilePath = generate_input(day, scale, args.output_dir, args.seed)
+            print(f"Day {day} at scale {scale:g}: ", file_path, f"({os.path.getsize(file_path):,} bytes)")
+
+
+def positive_scale(value: str) -> Scale:
+    scale: Scale = float(value)
+    if scale <= 0:
+        raise argparse.ArgumentTypeError(f"Scale '{value}' has to be a positive number.")
+    return scale
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate valid inputs of all days at a scale of the original inputs (e.g. 10, 100, 10000).\n"
+            "Inputs are written to <output_dir>/x<scale>-seed<seed>/2024-day-<day>.input\n"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("output_dir", type=str, help="Directory to write inputs to")
+    parser.add_argument("--days", nargs="+", type=int, choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--scale", nargs="+", type=positive_scale, default=[10.0], help="Scales of inputs")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the random generator")
+    main(parser.parse_args())
@@ -0,0 +1,91 @@
+import typing
+import numpy as np
+
+from utils import Grid
+
+
+class Cell(typing.NamedTuple):
+    row: int
+    col: int
+    letter: int
+
+
+Pattern: typing.TypeAlias = frozenset[Cell]
+# a linear map of offsets of cells - ((row from row, row from col), (col from row, col from col))
+Transformation: typing.TypeAlias = tuple[tuple[int, int], tuple[int, int]]
+
+
+# rotations and reflections of a square
+SYMMETRIES: list[Transformation] = [
+    ((1, 0), (0, 1)),
+    ((0, 1), (-1, 0)),
+    ((-1, 0), (0, -1)),
+    ((0, -1), (1, 0)),
+    ((1, 0), (0, -1)),
+    ((0, -1), (-1, 0)),
+    ((-1, 0), (0, 1)),
+    ((0, 1), (1, 0)),
+]
+# turns a row of cells into a diagonal (the cells stay neighbours, so it makes sense for words only)
+DIAGONAL_TURN: Transformation = ((1, 1), (-1, 1))
+
+
+def normalize(cells: typing.Iterable[Cell]) -> Pattern:
+    """Shift cells, so the top row and the left column of the pattern are zero."""
+    cells = list(cells)
+    top: int = min(cell.row for cell in cells)
+    left: int = min(cell.col for cell in cells)
+    return frozenset(Cell(cell.row - top, cell.col - left, cell.letter) for cell in cells)
+
+
+def transform(pattern: Pattern, transformation: Transformation) -> Pattern:
+    (row_row, row_col), (col_row, col_col) = transformation
+    return normalize(
+        Cell(row_row * cell.row + row_col * cell.col, col_row * cell.row + col_col * cell.col, cell.letter)
+        for cell in pattern
+    )
+
+
+def word_pattern(word: str) -> Pattern:
+    return normalize(Cell(0, col, ord(letter)) for col, letter in enumerate(word))
+
+
+def stencil_pattern(lines: list[str], blank: str = ".") -> Pattern:
+    """Pattern of letters of the lines, blank characters match anything."""
+    return normalize(
+        Cell(row, col, ord(letter))
+        for row, line in enumerate(lines)
+        for col, letter in enumerate(line)
+        if letter != blank
+    )
+
+
+def orientations(pattern: Pattern, diagonal: bool = False) -> list[Pattern]:
+    """All distinct rotations and reflections of the pattern (a symmetric pattern has less than 8 of them).
+
+    With diagonal the pattern is turned by 45 degrees too, so a word is searched in all 8 directions.
+    """
+    patterns: list[Pattern] = [pattern, transform(pattern, DIAGONAL_TURN)] if diagonal else [pattern]
+    return list(dict.fromkeys(transform(turned, symmetry) for turned in patterns for symmetry in SYMMETRIES))
+
+
+def count_matches(grid: Grid, patterns: list[Pattern]) -> int:
+    """Count matches of all patterns at all positions of the grid.
+
+    The grid is compared with every letter only once, a pattern is matched by AND-ing shifted slices of masks
+    of its letters, so adding a pattern costs no reading and no comparison of characters.
+    """
+    masks: dict[int, np.typing.NDArray[np.bool_]] = {}
+    count: int = 0
+    for pattern in patterns:
+        height: int = grid.shape[0] - max(cell.row for cell in pattern)
+        width: int = grid.shape[1] - max(cell.col for cell in pattern)
+        if height <= 0 or width <= 0:
+            continue
+        found = np.ones((height, width), dtype=np.bool_)
+        for cell in pattern:
+            if cell.letter not in masks:
+                masks[cell.letter] = grid == cell.letter
+            found &= masks[cell.letter][cell.row : cell.row + height, cell.col : cell.col + width]
+        count += int(found.sum())
+    return count
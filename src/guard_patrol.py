@@ -0,0 +1,166 @@
+import typing
+from dataclasses import dataclass, field
+from functools import cached_property
+import numpy as np
+
+from utils import Grid
+
+
+# cells of the map are numbered row by row, directions clockwise from north
+Cell: typing.TypeAlias = int
+Direction: typing.TypeAlias = int
+Segment: typing.TypeAlias = tuple[Cell, Direction, int]
+Obstacles: typing.TypeAlias = np.typing.NDArray[np.bool_]
+VisitedMap: typing.TypeAlias = np.typing.NDArray[np.bool_]
+# a new obstacle and the cell and the direction of the guard just before meeting it
+Candidate: typing.TypeAlias = tuple[Cell, Cell, Direction]
+JumpLists: typing.TypeAlias = tuple[list[list[int]], list[list[bool]]]
+
+
+NORTH, EAST, SOUTH, WEST = range(4)
+
+
+def free_steps_to_the_east(obstacles: Obstacles) -> tuple[np.typing.NDArray[np.int32], Obstacles]:
+    """Count free cells to the east of every cell and find out whether the grid is left behind them."""
+    cols: int = obstacles.shape[1]
+    blockers = np.where(obstacles, np.arange(cols, dtype=np.int32), np.int32(cols))
+    # the nearest obstacle (or the edge) strictly behind the cell
+    behind = np.concatenate((blockers[:, 1:], np.full((obstacles.shape[0], 1), cols, dtype=np.int32)), axis=1)
+    next_blocker = np.minimum.accumulate(behind[:, ::-1], axis=1)[:, ::-1]
+    return next_blocker - np.arange(1, cols + 1, dtype=np.int32), next_blocker == cols
+
+
+@dataclass
+class PatrolMap:
+    """Map of obstacles with a jump table - the guard walks from an obstacle to the next one, not step by step."""
+
+    obstacles: Obstacles
+    start: Cell
+    jump_lists: JumpLists | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "PatrolMap":
+        return cls(obstacles=grid == ord("#"), start=int(np.flatnonzero(grid == ord("^"))[0]))
+
+    @classmethod
+    def from_lines(cls, lines: typing.Iterable[str]) -> "PatrolMap":
+        rows: list[bytes] = [line.strip().encode("ascii") for line in lines if line.strip()]
+        return cls.from_grid(np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1))
+
+    @property
+    def cols(self) -> int:
+        return self.obstacles.shape[1]
+
+    @cached_property
+    def deltas(self) -> tuple[int, int, int, int]:
+        return -self.cols, 1, self.cols, -1
+
+    @cached_property
+    def jump_table(self) -> tuple[np.typing.NDArray[np.int32], Obstacles]:
+        """Free steps and leaving the grid for every direction and cell."""
+        east = free_steps_to_the_east(self.obstacles)
+        west = free_steps_to_the_east(self.obstacles[:, ::-1])
+        south = free_steps_to_the_east(self.obstacles.T)
+        north = free_steps_to_the_east(self.obstacles[::-1].T)
+        tables = (
+            (north[0].T[::-1], north[1].T[::-1]),
+            east,
+            (south[0].T, south[1].T),
+            (west[0][:, ::-1], west[1][:, ::-1]),
+        )
+        return np.stack([steps.ravel() for steps, _ in tables]), np.stack([exits.ravel() for _, exits in tables])
+
+    def walk(self) -> typing.Iterator[Segment]:
+        """Segments of the guard path - the first cell, the direction and the count of steps in the direction."""
+        steps, exits = self.jump_table
+        cell: Cell = self.start
+        direction: Direction = NORTH
+        seen: set[tuple[Cell, Direction]] = set()
+        while (cell, direction) not in seen:
+            seen.add((cell, direction))
+            count_of_steps: int = int(steps[direction, cell])
+            yield cell, direction, count_of_steps
+            if exits[direction, cell]:
+                return
+            cell += count_of_steps * self.deltas[direction]
+            direction = (direction + 1) % 4
+
+    def leaves_grid(self) -> bool:
+        # the walk ends either by leaving the grid, or by meeting its own path again
+        *_, (cell, direction, _) = self.walk()
+        return bool(self.jump_table[1][direction, cell])
+
+    def visited_map(self) -> VisitedMap:
+        visited: VisitedMap = np.zeros(self.obstacles.size, dtype=np.bool_)
+        for cell, direction, steps in self.walk():
+            end: Cell = cell + steps * self.deltas[direction]
+            visited[min(cell, end) : max(cell, end) + 1 : abs(self.deltas[direction])] = True
+        return visited.reshape(self.obstacles.shape)
+
+    def candidates(self) -> list[Candidate]:
+        """New obstacles worth trying - cells of the original path (but the start), the guard meets them first.
+
+        The path up to the first visit of the cell does not change by the obstacle, so its checking starts there.
+        """
+        first_visits: dict[Cell, Candidate] = {}
+        for cell, direction, steps in self.walk():
+            delta: int = self.deltas[direction]
+            for position in range(cell + delta, cell + (steps + 1) * delta, delta):
+                if position not in first_visits and position != self.start:
+                    first_visits[position] = (position, position - delta, direction)
+        return list(first_visits.values())
+
+    def build_jump_lists(self) -> JumpLists:
+        """Jump table as lists (faster to index by single cells than arrays), built once.
+
+        Build them before forking workers, so the workers inherit the lists instead of building their own.
+        """
+        if self.jump_lists is None:
+            steps, exits = self.jump_table
+            self.jump_lists = steps.tolist(), exits.tolist()
+        return self.jump_lists
+
+    def distance(self, cell: Cell, direction: Direction, obstacle_row: int, obstacle_col: int) -> int:
+        """Distance of the obstacle ahead of the guard, zero when it is not ahead."""
+        row, col = divmod(cell, self.cols)
+        if direction == NORTH:
+            return row - obstacle_row if col == obstacle_col else 0
+        if direction == EAST:
+            return obstacle_col - col if row == obstacle_row else 0
+        if direction == SOUTH:
+            return obstacle_row - row if col == obstacle_col else 0
+        # WEST
+        return col - obstacle_col if row == obstacle_row else 0
+
+    def loops(self, candidate: Candidate, seen: list[int], stamp: int) -> bool:
+        """Walk with the new obstacle patched into the jump table until the guard leaves, or turns as before.
+
+        Turns are marked in seen by the stamp of the candidate, so nothing has to be cleared for the next one.
+        """
+        steps, exits = self.build_jump_lists()
+        obstacle, cell, direction = candidate
+        obstacle_row, obstacle_col = divmod(obstacle, self.cols)
+        while True:
+            free: int = steps[direction][cell]
+            distance: int = self.distance(cell, direction, obstacle_row, obstacle_col)
+            if 0 < distance <= free:
+                free = distance - 1
+            elif exits[direction][cell]:
+                return False
+            cell += free * self.deltas[direction]
+            if seen[4 * cell + direction] == stamp:
+                return True
+            seen[4 * cell + direction] = stamp
+            direction = (direction + 1) % 4
+
+    def new_seen(self) -> list[int]:
+        return [0] * (4 * self.obstacles.size)
+
+    def count_loops(self, candidates: list[Candidate], seen: list[int] | None = None, first_stamp: int = 1) -> int:
+        """Count candidates making the guard loop, stamps of candidates are numbered from first_stamp.
+
+        A seen list reused for more calls needs stamps not used by the previous calls.
+        """
+        if seen is None:
+            seen = self.new_seen()
+        return sum(self.loops(candidate, seen, stamp) for stamp, candidate in enumerate(candidates, start=first_stamp))
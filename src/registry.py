@@ -0,0 +1,138 @@
+import ast
+import argparse
+import glob
+import importlib.util
+import os
+import re
+import sys
+import types
+import typing
+from dataclasses import dataclass, field
+
+from utils import FilePath
+
+
+ADVENT_YEAR: int = 2024
+SOURCE_DIR: FilePath = os.path.dirname(os.path.abspath(__file__))
+MEDIA_DIR: FilePath = os.path.normpath(os.path.join(SOURCE_DIR, "..", "media"))
+MODULE_NAME_PATTERN: re.Pattern = re.compile(rf"^{ADVENT_YEAR}-day-(?P<day>\d+)(?P<part>[a-z]?)\.py$")
+
+
+Day: typing.TypeAlias = str
+Mode: typing.TypeAlias = str
+Part: typing.TypeAlias = str
+Answer: typing.TypeAlias = object
+
+
+@dataclass
+class Solver:
+    day: Day
+    path: FilePath
+    modes: list[Mode]
+    parts: dict[Part, list[Mode]] = field(default_factory=dict)
+    # modes running in a process pool, their work is not done (and its memory not allocated) in this process
+    pool_modes: list[Mode] = field(default_factory=list)
+    module: types.ModuleType | None = field(default=None, repr=False)
+
+    @property
+    def number(self) -> int:
+        return int(self.day.rstrip("abcdefghijklmnopqrstuvwxyz"))
+
+    def part(self, mode: Mode) -> Part:
+        for part, modes in self.parts.items():
+            if mode in modes:
+                return part
+        return ""
+
+    def input_path(self, media_dir: FilePath = MEDIA_DIR) -> FilePath:
+        return os.path.join(media_dir, f"{ADVENT_YEAR}-day-{self.number}.input")
+
+    def load(self) -> types.ModuleType:
+        if self.module is None:
+            name: str = os.path.splitext(os.path.basename(self.path))[0]
+            spec = importlib.util.spec_from_file_location(name, self.path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Cannot load solver module from '{self.path}'.")
+            module: types.ModuleType = importlib.util.module_from_spec(spec)
+            # functions of registered modules can be pickled (e.g. sent to a process pool)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            self.module = module
+        return self.module
+
+    def solve(self, mode: Mode, file_path: FilePath) -> Answer:
+        if mode not in self.modes:
+            raise ValueError(f"Day {self.day} has no mode <{mode}>, available modes: {self.modes}")
+        return self.load().main(argparse.Namespace(file_path=file_path, mode=mode))
+
+
+Registry: typing.TypeAlias = dict[Day, Solver]
+
+
+def read_module_constant(path: FilePath, name: str) -> object:
+    """Find a module level (annotated) constant of a solver without importing (and so running) the module."""
+    with open(path) as file_handler:
+        try:
+            tree: ast.Module = ast.parse(file_handler.read())
+        except SyntaxError:
+            return None
+    for node in tree.body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.target.id == name:
+            return ast.literal_eval(node.value) if node.value else None
+    return None
+
+
+def read_modes(path: FilePath) -> list[Mode] | None:
+    """Find the module level MODES list of a solver.
+
+    Modules without MODES (the scripts exported from notebooks) are not solvers with modes and are skipped.
+    """
+    modes = read_module_constant(path, "MODES")
+    return list(modes) if isinstance(modes, (list, tuple)) else None
+
+
+def read_parts(path: FilePath) -> dict[Part, list[Mode]]:
+    """Find the module level PARTS mapping of a solver - modes answering the same part of the puzzle.
+
+    Modules without PARTS answer one part by all their modes.
+    """
+    parts = read_module_constant(path, "PARTS")
+    return {part: list(modes) for part, modes in parts.items()} if isinstance(parts, dict) else {}
+
+
+def read_pool_modes(path: FilePath) -> list[Mode]:
+    pool_modes = read_module_constant(path, "POOL_MODES")
+    return list(pool_modes) if isinstance(pool_modes, (list, tuple)) else []
+
+
+def sort_key(day: Day) -> tuple[int, str]:
+    match = re.match(r"(\d+)(\w*)", day)
+    if match is None:
+        raise ValueError(f"Wrong day: {day}")
+    return int(match.group(1)), match.group(2)
+
+
+def discover_solvers(source_dir: FilePath = SOURCE_DIR) -> Registry:
+    registry: Registry = {}
+    for path in glob.glob(os.path.join(source_dir, f"{ADVENT_YEAR}-day-*.py")):
+        match = MODULE_NAME_PATTERN.match(os.path.basename(path))
+        if match is None:
+            continue
+        modes: list[Mode] | None = read_modes(path)
+        if not modes:
+            continue
+        day: Day = match.group("day") + match.group("part")
+        registry[day] = Solver(
+            day=day, path=path, modes=modes, parts=read_parts(path), pool_modes=read_pool_modes(path)
+        )
+    return {day: registry[day] for day in sorted(registry, key=sort_key)}
+
+
+def select_runs(registry: Registry, days: list[Day] | None, modes: list[Mode] | None) -> list[tuple[Solver, Mode]]:
+    return [
+        (solver, mode)
+        for day, solver in registry.items()
+        if not days or day in days
+        for mode in solver.modes
+        if not modes or mode in modes
+    ]
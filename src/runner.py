@@ -0,0 +1,77 @@
+import argparse
+import time
+import typing
+from rich import print
+from rich.table import Table
+
+from utils import (
+    create_arg_parser,
+    validate_dir_path,
+    parse_args_run_and_profile,
+)
+from registry import (
+    Answer,
+    Day,
+    Mode,
+    Registry,
+    MEDIA_DIR,
+    discover_solvers,
+    select_runs,
+)
+
+
+REGISTRY: Registry = discover_solvers()
+
+
+class Result(typing.NamedTuple):
+    day: Day
+    mode: Mode
+    answer: Answer
+    seconds: float
+
+
+def print_results(results: list[Result], total_seconds: float):
+    table: Table = Table(title="Advent Of Code - solved in one process")
+    table.add_column("Day")
+    table.add_column("Mode")
+    table.add_column("Answer", justify="right")
+    table.add_column("Time \\[s]", justify="right")
+    for result in results:
+        table.add_row(result.day, result.mode, str(result.answer), f"{result.seconds:.4f}")
+    table.add_section()
+    table.add_row("all", "", "", f"{total_seconds:.4f}")
+    print(table)
+
+
+def main(args: argparse.Namespace) -> list[Result]:
+    results: list[Result] = []
+    started: float = time.perf_counter()
+    for solver, mode in select_runs(REGISTRY, args.days, args.modes):
+        start: float = time.perf_counter()
+        answer: Answer = solver.solve(mode, solver.input_path(args.media))
+        results.append(Result(day=solver.day, mode=mode, answer=answer, seconds=time.perf_counter() - start))
+    print_results(results, time.perf_counter() - started)
+    return results
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = create_arg_parser(
+        "Run solutions of all days (and all their modes) in one process and time the whole suite."
+    )
+    parser.add_argument(
+        "--days",
+        nargs="+",
+        choices=list(REGISTRY),
+        metavar="DAY",
+        help=f"Days to run (default all): {', '.join(REGISTRY)}",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=sorted({mode for solver in REGISTRY.values() for mode in solver.modes}),
+        metavar="MODE",
+        help="Run only these modes of selected days (default all)",
+    )
+    parser.add_argument("--media", type=validate_dir_path, default=MEDIA_DIR, help="Directory with input files")
+
+    parse_args_run_and_profile(parser, main)
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+from dataclasses import dataclass, asdict
+from rich import print
+from rich.table import Table
+
+from utils import FilePath
+from registry import (
+    Day,
+    Mode,
+    Registry,
+    Solver,
+    discover_solvers,
+    select_runs,
+)
+from benchmark import positive_int, time_solver
+from generators import DEFAULT_SEED, Scale, generate_input, positive_scale
+
+
+REGISTRY: Registry = discover_solvers()
+INPUTS_DIR: FilePath = os.path.join(tempfile.gettempdir(), "advent-of-code-inputs")
+
+
+@dataclass
+class ScalingPoint:
+    day: Day
+    mode: Mode
+    scale: Scale
+    size: int
+    seconds: float
+    answer: str
+
+
+def measure_scaling(solver: Solver, mode: Mode, args: argparse.Namespace) -> list[ScalingPoint]:
+    points: list[ScalingPoint] = []
+    for scale in sorted(args.scale):
+        file_path: FilePath = generate_input(solver.number, scale, args.inputs, args.seed)
+        runs: list[tuple[object, float]] = [time_solver(solver, mode, file_path) for _ in range(args.repeat)]
+        seconds: float = statistics.median(run[1] for run in runs)
+        points.append(ScalingPoint(solver.day, mode, scale, os.path.getsize(file_path), seconds, str(runs[0][0])))
+        if seconds > args.budget:
+            # the mode broke down, bigger inputs would take too long
+            break
+    return points
+
+
+def print_points(points: list[ScalingPoint], scales: list[Scale]):
+    table: Table = Table(title="Advent Of Code - runtime \\[s] versus scale of input")
+    table.add_column("Day")
+    table.add_column("Mode")
+    for scale in scales:
+        table.add_column(f"x{scale:g}", justify="right")
+    runs: dict[tuple[Day, Mode], dict[Scale, float]] = {}
+    for point in points:
+        runs.setdefault((point.day, point.mode), {})[point.scale] = point.seconds
+    for (day, mode), seconds in runs.items():
+        table.add_row(day, mode, *(f"{seconds[scale]:.4f}" if scale in seconds else "-" for scale in scales))
+    print(table)
+
+
+def plot_points(points: list[ScalingPoint], plot_file: FilePath):
+    # matplotlib is needed only for plotting, there is no reason to import it sooner
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    days: list[Day] = list(dict.fromkeys(point.day for point in points))
+    figure, axes = plt.subplots(len(days), 1, figsize=(8, 4 * len(days)), squeeze=False)
+    for ax, day in zip(axes[:, 0], days):
+        for mode in dict.fromkeys(point.mode for point in points if point.day == day):
+            mode_points: list[ScalingPoint] = [point for point in points if point.day == day and point.mode == mode]
+            ax.plot(
+                [point.size for point in mode_points], [point.seconds for point in mode_points], marker="o", label=mode
+            )
+        ax.set(title=f"Day {day}", xlabel="input size [bytes]", ylabel="runtime [s]", xscale="log", yscale="log")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    figure.tight_layout()
+    figure.savefig(plot_file)
+
+
+def main(args: argparse.Namespace) -> list[ScalingPoint]:
+    points: list[ScalingPoint] = []
+    for solver, mode in select_runs(REGISTRY, args.days, args.modes):
+        points += measure_scaling(solver, mode, args)
+    print_points(points, sorted(args.scale))
+    if args.output:
+        with open(args.output, "w") as file_handler:
+            json.dump([asdict(point) for point in points], file_handler, indent=2)
+        print(f"Results written to: {args.output}")
+    if args.plot:
+        plot_points(points, args.plot)
+        print(f"Plot written to: {args.plot}")
+    return points
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure runtime of every mode of every day on generated inputs of growing scale.\n"
+            "A mode is not measured on bigger inputs once its runtime exceeds the budget.\n"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("--days", nargs="+", choices=list(REGISTRY), metavar="DAY", help="Days to measure")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=sorted({mode for solver in REGISTRY.values() for mode in solver.modes}),
+        metavar="MODE",
+        help="Measure only these modes of selected days (default all)",
+    )
+    parser.add_argument("--scale", nargs="+", type=positive_scale, default=[1.0, 10.0, 100.0], help="Scales")
+    parser.add_argument("--repeat", type=positive_int, default=1, help="Number of measured runs for every scale")
+    parser.add_argument("--budget", type=float, default=10.0, help="Runtime [s] after which a mode is not scaled up")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the generated inputs")
+    parser.add_argument("--inputs", type=str, default=INPUTS_DIR, help="Directory for generated inputs")
+    parser.add_argument("--output", type=str, default=None, help="JSON file to write the results to")
+    parser.add_argument("--plot", type=str, default=None, help="Image file to plot runtime versus input size to")
+    main(parser.parse_args())
@@ -1,5 +1,9 @@
 import typing
+import warnings
+import itertools
 import os
+from dataclasses import dataclass
+from functools import cached_property
 import sys
 import argparse
 import cProfile
@@ -20,7 +24,13 @@ def validate_file_path(path: str) -> str:
     return path
 
 
-def parse_args_run_and_profile(parser: argparse.ArgumentParser, main: typing.Callable[[argparse.Namespace], None]):
+def validate_dir_path(path: str) -> str:
+    if not os.path.isdir(path):
+        raise argparse.ArgumentTypeError(f"Directory '{path}' does not exist or it is not a directory.")
+    return path
+
+
+def parse_args_run_and_profile(parser: argparse.ArgumentParser, main: typing.Callable[[argparse.Namespace], object]):
     args_from_cli = parser.parse_args()
     print("These input arguments were received: ", args_from_cli)
 
@@ -47,9 +57,31 @@ class GatheredLocations(typing.TypedDict):
 Locations: typing.TypeAlias = GatheredLocations | np.typing.NDArray[np.int_]
 ReportLevel: typing.TypeAlias = int
 Report: typing.TypeAlias = list[int]
-Reports: typing.TypeAlias = list[Report]
+ListOfReports: typing.TypeAlias = list[Report]
+
+
+class PaddedReports(typing.NamedTuple):
+    # reports are ragged, so levels are padded by zeros up to the length of the longest report
+    levels: np.typing.NDArray[np.int64]
+    lengths: np.typing.NDArray[np.int64]
+
+
+Reports: typing.TypeAlias = ListOfReports | PaddedReports
 MemRecord: typing.TypeAlias = str
 MemRecords: typing.TypeAlias = list[MemRecord]
+MemChunk: typing.TypeAlias = bytes
+StreamOfMemChunks: typing.TypeAlias = typing.Iterator[MemChunk]
+Row: typing.TypeAlias = bytes
+StreamOfRows: typing.TypeAlias = typing.Iterator[Row]
+
+
+class MappedMemory(typing.NamedTuple):
+    # the memory is mapped by every process scanning it, only the file and its size are passed around
+    file: FilePath
+    size: int
+
+
+Memory: typing.TypeAlias = MemRecords | StreamOfMemChunks | MappedMemory
 StreamOfLines: typing.TypeAlias = typing.Iterator[str]
 
 
@@ -65,6 +97,10 @@ class ReadingMemRecords(typing.Protocol):
     def __call__(self, file: FilePath) -> MemRecords: ...
 
 
+class ReadingMemory(typing.Protocol):
+    def __call__(self, file: FilePath) -> Memory: ...
+
+
 class OpenStreamOfLines(typing.Protocol):
     def __call__(self, file: FilePath) -> StreamOfLines: ...
 
@@ -73,38 +109,131 @@ class CreateStreamOfLines(typing.Protocol):
     def __call__(self, file: FilePath) -> typing.Iterator[StreamOfLines]: ...
 
 
-def read_locations_from_file(file: FilePath) -> Locations:
-    _first: LocationList = []
-    _second: LocationList = []
-    with open(file) as file_handler:
-        for line in file_handler:
-            locations = list(
-                part
-                for part in (int(line_part) if bool(line_part.strip()) else None for line_part in line.split(" "))
-                if part is not None
-            )
-            _first.append(locations[0])
-            _second.append(locations[1])
+MEMORY_MAP_THRESHOLD: int = 64 * 1024 * 1024
+Characters: typing.TypeAlias = np.typing.NDArray[np.uint8]
+Grid: typing.TypeAlias = np.typing.NDArray[np.uint8]
+WordSearch: typing.TypeAlias = typing.Iterator[StreamOfLines] | Grid
+
+
+class ReadingWordSearch(typing.Protocol):
+    def __call__(self, file: FilePath) -> WordSearch: ...
+
+
+def read_characters(file: FilePath, memory_map: bool | None = None) -> Characters:
+    """Read the whole file as bytes, big files (or when asked) are memory-mapped instead of being read."""
+    size: int = os.path.getsize(file)
+    if size == 0:
+        return np.zeros(0, dtype=np.uint8)
+    if memory_map or (memory_map is None and size > MEMORY_MAP_THRESHOLD):
+        return np.memmap(file, dtype=np.uint8, mode="r")
+    with open(file, "rb") as file_handler:
+        return np.frombuffer(file_handler.read(), dtype=np.uint8)
+
+
+def read_grid(file: FilePath) -> Grid:
+    """Read lines of the same length as a 2D array of characters (a view of the file without line ends)."""
+    characters: Characters = read_characters(file)
+    if len(characters) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    if characters[-1] != ord("\n"):
+        characters = np.append(characters, np.uint8(ord("\n")))
+    width: int = int(np.argmax(characters == ord("\n")))
+    return characters.reshape(-1, width + 1)[:, :width]
+
+
+def accumulate_digits(
+    characters: Characters, starts: np.typing.NDArray[np.int64], lengths: np.typing.NDArray[np.int64]
+) -> np.typing.NDArray[np.int64]:
+    values = np.zeros(len(starts), dtype=np.int64)
+    shortest: int = int(lengths.min()) if len(lengths) else 0
+    for position in range(int(lengths.max(initial=0))):
+        if position < shortest:
+            values *= 10
+            values += characters[starts + position] - ord("0")
+        else:
+            longer = np.flatnonzero(lengths > position)
+            values[longer] = values[longer] * 10 + (characters[starts[longer] + position] - ord("0"))
+    return values
+
+
+@dataclass
+class ParsedIntegers:
+    """All the integers of a file parsed at once - no Python code runs per line or per number.
+
+    Integers separated by white spaces only are parsed by numpy itself, others (e.g. "47|53" or "190: 10 19")
+    are tokenized by array operations and accumulated digit by digit.
+    """
+
+    characters: Characters
+
+    @cached_property
+    def edges(self) -> np.typing.NDArray[np.int64]:
+        # characters below "0" wrap around to big numbers
+        digits = (self.characters - np.uint8(ord("0"))) < 10
+        return np.flatnonzero(np.diff(digits.view(np.int8), prepend=np.int8(0), append=np.int8(0)))
+
+    @property
+    def starts(self) -> np.typing.NDArray[np.int64]:
+        return self.edges[0::2]
+
+    @cached_property
+    def values(self) -> np.typing.NDArray[np.int64]:
+        try:
+            with warnings.catch_warnings():
+                # older numpy only warns about data it cannot parse and returns the integers before it
+                warnings.simplefilter("ignore", DeprecationWarning)
+                values = np.fromstring(self.characters, dtype=np.int64, sep=" ")  # type: ignore[call-overload]
+        except ValueError:
+            # there is something else than white spaces between integers
+            pass
+        else:
+            # a partial parse (or a zero found in white spaces only) does not count all integers
+            if len(values) == len(self.starts):
+                return values
+        starts = self.starts
+        values = accumulate_digits(self.characters, starts, self.edges[1::2] - starts)
+        signed = np.flatnonzero(starts > 0)
+        values[signed[self.characters[starts[signed] - 1] == ord("-")]] *= -1
+        return values
+
+    @cached_property
+    def line_ends(self) -> np.typing.NDArray[np.int64]:
+        return np.flatnonzero(self.characters == ord("\n"))
+
+    @property
+    def count_of_lines(self) -> int:
+        unterminated: bool = len(self.characters) > 0 and self.characters[-1] != ord("\n")
+        return len(self.line_ends) + (1 if unterminated else 0)
+
+    def count_per_line(self) -> np.typing.NDArray[np.int64]:
+        values_before_line_end = np.searchsorted(self.starts, self.line_ends)
+        if len(self.line_ends) < self.count_of_lines:
+            values_before_line_end = np.append(values_before_line_end, len(self.starts))
+        return np.diff(values_before_line_end, prepend=0).astype(np.int64)
 
-    return GatheredLocations(first=_first, second=_second)
+
+def read_locations_from_file(file: FilePath) -> Locations:
+    locations = ParsedIntegers(read_characters(file)).values.reshape(-1, 2)
+    return GatheredLocations(first=locations[:, 0].tolist(), second=locations[:, 1].tolist())
 
 
 def numpy_read_locations(file: FilePath) -> Locations:
-    return np.loadtxt(file, dtype=int)
+    return ParsedIntegers(read_characters(file)).values.reshape(-1, 2)
 
 
 def read_reports_from_file(file: FilePath) -> Reports:
-    reports: Reports = []
-    with open(file) as file_handler:
-        for line in file_handler:
-            report: Report = list(
-                level
-                for level in (int(line_part) if bool(line_part.strip()) else None for line_part in line.split(" "))
-                if level is not None
-            )
-            reports.append(report)
+    integers: ParsedIntegers = ParsedIntegers(read_characters(file))
+    ends: list[int] = np.cumsum(integers.count_per_line()).tolist()
+    levels: list[int] = integers.values.tolist()
+    return [levels[start:end] for start, end in zip([0] + ends[:-1], ends)]
 
-    return reports
+
+def numpy_read_reports(file: FilePath) -> Reports:
+    integers: ParsedIntegers = ParsedIntegers(read_characters(file))
+    lengths = integers.count_per_line()
+    padded = np.zeros((integers.count_of_lines, lengths.max(initial=0)), dtype=np.int64)
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = integers.values
+    return PaddedReports(levels=padded, lengths=lengths)
 
 
 def read_mem_records_from_file(file: FilePath) -> MemRecords:
@@ -116,11 +245,44 @@ def read_mem_records_from_file(file: FilePath) -> MemRecords:
     return records
 
 
+MEM_CHUNK_SIZE: int = 1024 * 1024
+
+
+def open_stream_of_mem_chunks(file: FilePath, chunk_size: int = MEM_CHUNK_SIZE) -> StreamOfMemChunks:
+    with open(file, "rb") as file_handler:
+        while chunk := file_handler.read(chunk_size):
+            yield chunk
+
+
+def open_stream_of_rows(file: FilePath, chunk_size: int = MEM_CHUNK_SIZE) -> StreamOfRows:
+    """Rows of the file without line ends, the file is read by big chunks (a row may be split among them)."""
+    pieces: list[bytes] = []
+    for chunk in open_stream_of_mem_chunks(file, chunk_size):
+        *rows, rest = chunk.split(b"\n")
+        if rows:
+            # pieces are joined once per row, so a row longer than a chunk is not copied again and again
+            rows[0] = b"".join(pieces + [rows[0]])
+            pieces = []
+            yield from rows
+        pieces.append(rest)
+    if row := b"".join(pieces):
+        yield row
+
+
+def map_memory_of_file(file: FilePath) -> MappedMemory:
+    return MappedMemory(file=file, size=os.path.getsize(file))
+
+
 def open_stream_of_lines(file: FilePath) -> StreamOfLines:
     with open(file) as file_handler:
         yield from file_handler
 
 
+def read_batches_of_lines(lines: StreamOfLines, size: int) -> typing.Iterator[list[str]]:
+    while batch := list(itertools.islice(lines, size)):
+        yield batch
+
+
 def create_stream_of_lines(file: FilePath) -> typing.Iterator[StreamOfLines]:
     while True:
         yield open_stream_of_lines(file)